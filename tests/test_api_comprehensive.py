@@ -3195,6 +3195,48 @@ class ComprehensiveApiTests(unittest.TestCase):
         self.assertEqual(stats.get("fallback_served"), 1)
         self.assertEqual(stats.get("fallback_reasons", {}).get("ai_disabled"), 1)
 
+    def test_next_question_defaults_to_first_session_dimension(self):
+        self._register()
+        created = self._create_session(topic="默认维度")
+        session_id = created["session_id"]
+        session_file = self.server.SESSIONS_DIR / f"{session_id}.json"
+        expected_dimension = self.server.get_dimension_order_for_session(self.server.safe_load_session(session_file))[0]
+
+        next_q = self.client.post(f"/api/sessions/{session_id}/next-question", json={})
+        self.assertEqual(next_q.status_code, 200, next_q.get_data(as_text=True))
+        self.assertEqual(next_q.get_json().get("dimension"), expected_dimension)
+
+    def test_next_question_reports_completed_dimension_stats(self):
+        self._register()
+        created = self._create_session(topic="维度完成统计")
+        session_id = created["session_id"]
+        dimension = list(created["dimensions"].keys())[0]
+        session_file = self.server.SESSIONS_DIR / f"{session_id}.json"
+        session_data = self.server.safe_load_session(session_file)
+        session_data["interview_log"] = [
+            {"dimension": dimension, "question": f"问题{idx}", "answer": "回答", "is_follow_up": is_follow_up}
+            for idx, is_follow_up in enumerate([False, True, True, False, True])
+        ]
+        session_data["dimensions"][dimension]["user_completed"] = True
+        self.server.save_session_json_and_sync(session_file, session_data)
+
+        old_resolve_ai_client = self.server.resolve_ai_client
+        try:
+            self.server.resolve_ai_client = lambda call_type="", **_kwargs: object() if call_type == "question" else old_resolve_ai_client(call_type=call_type, **_kwargs)
+            response = self.client.post(
+                f"/api/sessions/{session_id}/next-question",
+                json={"dimension": dimension},
+            )
+        finally:
+            self.server.resolve_ai_client = old_resolve_ai_client
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        payload = response.get_json()
+        self.assertTrue(payload.get("completed"))
+        self.assertEqual(payload.get("completion_reason"), "user_completed")
+        self.assertEqual(payload.get("stats", {}).get("formal_questions"), 2)
+        self.assertEqual(payload.get("stats", {}).get("follow_ups"), 3)
+        self.assertEqual(payload.get("decision_meta", {}).get("follow_up_round"), 1)
+
     def test_next_question_returns_429_when_generation_slots_exhausted(self):
         self._register()
         created = self._create_session(topic="问题并发闸门")
@@ -3457,6 +3499,60 @@ class ComprehensiveApiTests(unittest.TestCase):
             self.server.generate_question_with_tiered_strategy = old_generate_question
             self.server._end_question_prefetch_inflight(cache_key, owner_event)
 
+    def test_next_question_waits_for_inflight_generation_of_same_question(self):
+        self._register()
+        created = self._create_session(topic="同题并发实时生成")
+        session_id = created["session_id"]
+        dimension = list(created["dimensions"].keys())[0]
+        session_file = self.server.SESSIONS_DIR / f"{session_id}.json"
+        session_signature = self.server.get_file_signature(session_file)
+        cache_key = self.server._build_question_result_cache_key(session_id, dimension, session_signature)
+        generation_key = f"{cache_key}|generation"
+        owner_event, is_owner = self.server._begin_question_prefetch_inflight(generation_key)
+        self.assertTrue(is_owner)
+
+        old_wait = self.server.QUESTION_GENERATION_INFLIGHT_WAIT_SECONDS
+        old_resolve_ai_client = self.server.resolve_ai_client
+        old_generate_question = self.server.generate_question_with_tiered_strategy
+        try:
+            self.server.QUESTION_GENERATION_INFLIGHT_WAIT_SECONDS = 2.0
+            self.server.resolve_ai_client = lambda call_type="question": object()
+
+            def _should_not_generate(*_args, **_kwargs):
+                raise AssertionError("同一问题已有实时生成在途时不应重复调用模型")
+
+            self.server.generate_question_with_tiered_strategy = _should_not_generate
+
+            def _complete_generation():
+                time.sleep(0.3)
+                self.server._set_question_result_cache(cache_key, {
+                    "question": "当前业务流程中最影响交付效率的环节是什么？",
+                    "options": ["需求评审", "跨部门审批", "上线验收"],
+                    "multi_select": False,
+                    "dimension": dimension,
+                    "ai_generated": True,
+                })
+                self.server._end_question_prefetch_inflight(generation_key, owner_event)
+
+            worker = threading.Thread(target=_complete_generation, daemon=True)
+            worker.start()
+
+            next_q = self.client.post(
+                f"/api/sessions/{session_id}/next-question",
+                json={"dimension": dimension},
+            )
+            worker.join(timeout=2.0)
+
+            self.assertEqual(next_q.status_code, 200, next_q.get_data(as_text=True))
+            payload = next_q.get_json() or {}
+            self.assertEqual(payload.get("question"), "当前业务流程中最影响交付效率的环节是什么？")
+            self.assertTrue(payload.get("cached"))
+        finally:
+            self.server.QUESTION_GENERATION_INFLIGHT_WAIT_SECONDS = old_wait
+            self.server.resolve_ai_client = old_resolve_ai_client
+            self.server.generate_question_with_tiered_strategy = old_generate_question
+            self.server._end_question_prefetch_inflight(generation_key, owner_event)
+
     def test_next_question_prefers_longer_wait_for_submit_prefetch(self):
         self._register()
         created = self._create_session(topic="提交后优先等待预取")
@@ -3838,6 +3934,107 @@ class ComprehensiveApiTests(unittest.TestCase):
             self.server.VISION_API_URL = old_vision_url
             self.server.requests.post = old_requests_post
 
+    def test_describe_image_with_vision_reuses_description_for_same_image_content(self):
+        old_enable_vision = self.server.ENABLE_VISION
+        old_api_key = self.server.ZHIPU_API_KEY
+        old_vision_url = self.server.VISION_API_URL
+        old_summary_cache_enabled = self.server.SUMMARY_CACHE_ENABLED
+        old_requests_post = self.server.requests.post
+        post_calls = []
+        try:
+            self.server.ENABLE_VISION = True
+            self.server.ZHIPU_API_KEY = "mock-zhipu-key"
+            self.server.VISION_API_URL = "https://vision.mock.local/api"
+            self.server.SUMMARY_CACHE_ENABLED = True
+
+            def _fake_post(*_args, **_kwargs):
+                post_calls.append(_kwargs.get("json"))
+                return types.SimpleNamespace(
+                    status_code=200,
+                    json=lambda: {"choices": [{"message": {"content": "一张业务流程图"}}]},
+                )
+
+            self.server.requests.post = _fake_post
+            with tempfile.TemporaryDirectory() as temp_dir:
+                image_path = Path(temp_dir) / "flow.png"
+                image_path.write_bytes(b"\x89PNG\r\n" + uuid.uuid4().bytes)
+                first = self.server.describe_image_with_vision(image_path, "flow.png")
+                second = self.server.describe_image_with_vision(image_path, "flow-copy.png")
+
+            self.assertEqual(1, len(post_calls))
+            self.assertEqual("[图片: flow.png]\n\n**AI 图片描述:**\n一张业务流程图", first)
+            self.assertEqual("[图片: flow-copy.png]\n\n**AI 图片描述:**\n一张业务流程图", second)
+        finally:
+            self.server.ENABLE_VISION = old_enable_vision
+            self.server.ZHIPU_API_KEY = old_api_key
+            self.server.VISION_API_URL = old_vision_url
+            self.server.SUMMARY_CACHE_ENABLED = old_summary_cache_enabled
+            self.server.requests.post = old_requests_post
+
+    def test_describe_image_with_vision_sends_mime_type_by_suffix(self):
+        old_enable_vision = self.server.ENABLE_VISION
+        old_api_key = self.server.ZHIPU_API_KEY
+        old_vision_url = self.server.VISION_API_URL
+        old_summary_cache_enabled = self.server.SUMMARY_CACHE_ENABLED
+        old_requests_post = self.server.requests.post
+        image_urls = []
+        try:
+            self.server.ENABLE_VISION = True
+            self.server.ZHIPU_API_KEY = "mock-zhipu-key"
+            self.server.VISION_API_URL = "https://vision.mock.local/api"
+            self.server.SUMMARY_CACHE_ENABLED = False
+
+            def _fake_post(*_args, **_kwargs):
+                content = _kwargs["json"]["messages"][0]["content"]
+                image_urls.append(content[1]["image_url"]["url"])
+                return types.SimpleNamespace(
+                    status_code=200,
+                    json=lambda: {"choices": [{"message": {"content": "图片"}}]},
+                )
+
+            self.server.requests.post = _fake_post
+            with tempfile.TemporaryDirectory() as temp_dir:
+                image_path = Path(temp_dir) / "image.bin"
+                image_path.write_bytes(uuid.uuid4().bytes)
+                for filename in ("PHOTO.WEBP", "chart.png", "scan.bmp", "noext"):
+                    self.server.describe_image_with_vision(image_path, filename)
+
+            self.assertEqual(
+                ["data:image/webp;", "data:image/png;", "data:image/jpeg;", "data:image/jpeg;"],
+                [url.split("base64,", 1)[0] for url in image_urls],
+            )
+        finally:
+            self.server.ENABLE_VISION = old_enable_vision
+            self.server.ZHIPU_API_KEY = old_api_key
+            self.server.VISION_API_URL = old_vision_url
+            self.server.SUMMARY_CACHE_ENABLED = old_summary_cache_enabled
+            self.server.requests.post = old_requests_post
+
+    def test_describe_image_with_vision_rejects_oversized_image_before_api_call(self):
+        old_enable_vision = self.server.ENABLE_VISION
+        old_api_key = self.server.ZHIPU_API_KEY
+        old_max_image_size_mb = self.server.MAX_IMAGE_SIZE_MB
+        old_requests_post = self.server.requests.post
+        post_calls = []
+        try:
+            self.server.ENABLE_VISION = True
+            self.server.ZHIPU_API_KEY = "mock-zhipu-key"
+            self.server.MAX_IMAGE_SIZE_MB = 1
+            self.server.requests.post = lambda *args, **kwargs: post_calls.append(kwargs)
+            with tempfile.TemporaryDirectory() as temp_dir:
+                image_path = Path(temp_dir) / "large.png"
+                with open(image_path, "wb") as handle:
+                    handle.truncate(3 * 1024 * 1024)
+                result = self.server.describe_image_with_vision(image_path, "large.png")
+
+            self.assertEqual("[图片: large.png] (文件过大: 3.0MB > 1MB)", result)
+            self.assertEqual([], post_calls)
+        finally:
+            self.server.ENABLE_VISION = old_enable_vision
+            self.server.ZHIPU_API_KEY = old_api_key
+            self.server.MAX_IMAGE_SIZE_MB = old_max_image_size_mb
+            self.server.requests.post = old_requests_post
+
     def test_document_upload_succeeds_when_object_storage_archive_fails(self):
         self._register()
         license_code = self._generate_license_batch(note="对象存储降级测试")["licenses"][0]["code"]
@@ -5197,6 +5394,30 @@ class ComprehensiveApiTests(unittest.TestCase):
         self.assertEqual(int(row["payload_size"] or 0), len(compact_payload.encode("utf-8")))
         self.assertEqual(signature[1], len(compact_payload.encode("utf-8")))
 
+    def test_save_session_json_and_sync_uses_local_file_signature(self):
+        self.server.set_license_enforcement_override(False)
+        self._register()
+        created = self._create_session(topic="本地会话签名", description="用于验证本地文件签名")
+        session_id = created["session_id"]
+        session_file = self.server.SESSIONS_DIR / f"{session_id}.json"
+        session_data = self.server.safe_load_session(session_file)
+        session_data["description"] = "中文描述，验证签名字节数与落盘文件一致"
+
+        signature = self.server.save_session_json_and_sync(session_file, session_data)
+        pretty_payload = self.server._serialize_session_payload(session_data)
+
+        stat = session_file.stat()
+        self.assertEqual(session_file.read_text(encoding="utf-8"), pretty_payload)
+        self.assertEqual(signature, (int(stat.st_mtime_ns), int(stat.st_size)))
+        self.assertEqual(signature[1], len(pretty_payload.encode("utf-8")))
+        with self.server.get_meta_index_connection() as conn:
+            row = conn.execute(
+                "SELECT payload_size FROM session_store WHERE session_id = ? LIMIT 1",
+                (session_id,),
+            ).fetchone()
+        self.assertIsNotNone(row)
+        self.assertEqual(int(row["payload_size"] or 0), int(stat.st_size))
+
     def test_safe_load_session_applies_report_runtime_meta_from_session_index(self):
         self.server.set_license_enforcement_override(False)
         self._register()
@@ -180,6 +180,24 @@ class QuestionFastStrategyTests(unittest.TestCase):
         )
         self.assertEqual(reason, "")
 
+    def test_parse_question_response_pairs_braces_outside_strings(self):
+        response = '好的，问题如下：{"question": "选择 {范围} 与 \\"重点\\"", "options": ["A}", "B{"]} 以上。'
+        parsed = self.server.parse_question_response(response)
+        self.assertEqual(
+            {
+                "question": '选择 {范围} 与 "重点"',
+                "options": ["A}", "B{"],
+                "multi_select": False,
+                "is_follow_up": False,
+            },
+            parsed,
+        )
+
+        # 第一个完整对象缺少 options 时整体判定失败，不继续拼凑后续对象
+        self.assertIsNone(
+            self.server.parse_question_response('{"question": "q1"} 补充 {"question": "q2", "options": ["A"]')
+        )
+
     def test_low_hit_rate_opens_fast_path_cooldown(self):
         for _ in range(4):
             self.server._record_question_fast_outcome(False, lane="question", reason="timeout")
@@ -795,6 +813,163 @@ class QuestionFastStrategyTests(unittest.TestCase):
         self.assertTrue(len(prompt) > 0)
         self.assertIsInstance(truncated_docs, list)
 
+    def test_build_prompt_keeps_legacy_reference_docs_compatible(self):
+        session = {
+            "topic": "机加工艺方案评审",
+            "session_id": "sid",
+            "reference_docs": [{"name": "旧版参考文档", "content": "旧版资料正文"}],
+            "research_docs": [{"name": "旧版调研文档", "content": "调研资料正文"}],
+            "interview_log": [],
+            "scenario_config": {
+                "dimensions": [
+                    {
+                        "id": "target_architecture",
+                        "name": "目标架构",
+                        "description": "确认边界和部署约束",
+                    }
+                ]
+            },
+        }
+
+        prompt, _truncated_docs, _meta = self.server.build_interview_prompt(
+            session,
+            "target_architecture",
+            [],
+            output_mode="full",
+            runtime_probe=True,
+        )
+
+        self.assertIn("旧版参考文档", prompt)
+        self.assertIn("旧版调研文档", prompt)
+
+    def test_summarize_document_streams_summary_text(self):
+        class FakeStream:
+            text_stream = ["第一段", "", "<think>草稿</think>第二段"]
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *_exc):
+                return False
+
+        stream_calls = []
+
+        class FakeMessages:
+            def stream(self, **kwargs):
+                stream_calls.append(kwargs)
+                return FakeStream()
+
+            def create(self, **_kwargs):
+                raise AssertionError("支持流式时不应走阻塞调用")
+
+        fake_client = types.SimpleNamespace(messages=FakeMessages())
+        recorded = []
+        with mock.patch.object(self.server, "ENABLE_SMART_SUMMARY", True), \
+                mock.patch.object(self.server, "SMART_SUMMARY_STREAM_ENABLED", True), \
+                mock.patch.object(self.server, "SUMMARY_CACHE_ENABLED", False), \
+                mock.patch.object(self.server, "resolve_ai_client", return_value=fake_client), \
+                mock.patch.object(self.server.metrics_collector, "record_api_call", side_effect=lambda **kw: recorded.append(kw)):
+            summary, summarized = self.server.summarize_document("资料片段 " * 600, "超长资料", "测试")
+
+        self.assertTrue(summarized)
+        self.assertEqual(summary, "第一段第二段")
+        self.assertEqual(len(stream_calls), 1)
+        self.assertEqual(
+            [item["call_type"] for item in recorded],
+            ["doc_summary_first_token", "doc_summary"],
+        )
+
+    def test_summarize_document_falls_back_to_create_without_stream(self):
+        response = types.SimpleNamespace(content=[{"type": "text", "text": "阻塞摘要"}])
+        fake_client = types.SimpleNamespace(
+            messages=types.SimpleNamespace(create=mock.Mock(return_value=response))
+        )
+        recorded = []
+        with mock.patch.object(self.server, "ENABLE_SMART_SUMMARY", True), \
+                mock.patch.object(self.server, "SMART_SUMMARY_STREAM_ENABLED", True), \
+                mock.patch.object(self.server, "SUMMARY_CACHE_ENABLED", False), \
+                mock.patch.object(self.server, "resolve_ai_client", return_value=fake_client), \
+                mock.patch.object(self.server.metrics_collector, "record_api_call", side_effect=lambda **kw: recorded.append(kw)):
+            summary, summarized = self.server.summarize_document("资料片段 " * 600, "超长资料", "测试")
+
+        self.assertTrue(summarized)
+        self.assertEqual(summary, "阻塞摘要")
+        fake_client.messages.create.assert_called_once()
+        self.assertEqual([item["call_type"] for item in recorded], ["doc_summary"])
+
+    def test_summarize_document_retries_create_when_stream_fails(self):
+        response = types.SimpleNamespace(content=[{"type": "text", "text": "回退摘要"}])
+
+        class FakeMessages:
+            def __init__(self):
+                self.create = mock.Mock(return_value=response)
+
+            def stream(self, **_kwargs):
+                raise RuntimeError("gateway does not support SSE")
+
+        fake_client = types.SimpleNamespace(messages=FakeMessages())
+        recorded = []
+        with mock.patch.object(self.server, "ENABLE_SMART_SUMMARY", True), \
+                mock.patch.object(self.server, "SMART_SUMMARY_STREAM_ENABLED", True), \
+                mock.patch.object(self.server, "SUMMARY_CACHE_ENABLED", False), \
+                mock.patch.object(self.server, "resolve_ai_client", return_value=fake_client), \
+                mock.patch.object(self.server.metrics_collector, "record_api_call", side_effect=lambda **kw: recorded.append(kw)):
+            summary, summarized = self.server.summarize_document("资料片段 " * 600, "超长资料", "测试")
+
+        self.assertTrue(summarized)
+        self.assertEqual(summary, "回退摘要")
+        fake_client.messages.create.assert_called_once()
+        self.assertEqual([item["call_type"] for item in recorded], ["doc_summary"])
+
+    def test_summarize_document_truncates_without_create_retry_on_stream_timeout_or_partial_output(self):
+        class PartialStream:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *_exc):
+                return False
+
+            @property
+            def text_stream(self):
+                yield "前半段"
+                raise RuntimeError("connection reset by peer")
+
+        stream_errors = {
+            "timeout": TimeoutError("Request timed out."),
+            "rate_limit": RuntimeError("Error code: 429 - rate limit exceeded"),
+        }
+        for case, error in list(stream_errors.items()) + [("partial", None)]:
+            with self.subTest(case=case):
+                class FakeMessages:
+                    def __init__(self):
+                        self.create = mock.Mock(side_effect=AssertionError("不应重试普通调用"))
+
+                    def stream(self, **_kwargs):
+                        if error is not None:
+                            raise error
+                        return PartialStream()
+
+                fake_client = types.SimpleNamespace(messages=FakeMessages())
+                with mock.patch.object(self.server, "ENABLE_SMART_SUMMARY", True), \
+                        mock.patch.object(self.server, "SMART_SUMMARY_STREAM_ENABLED", True), \
+                        mock.patch.object(self.server, "SUMMARY_CACHE_ENABLED", False), \
+                        mock.patch.object(self.server, "resolve_ai_client", return_value=fake_client):
+                    summary, summarized = self.server.summarize_document("资料片段 " * 600, "超长资料", "测试")
+
+                self.assertFalse(summarized)
+                self.assertNotIn("前半段", summary)
+                fake_client.messages.create.assert_not_called()
+
+    def test_should_search_matches_ascii_keywords_case_insensitively(self):
+        with mock.patch.object(self.server, "ENABLE_WEB_SEARCH", True):
+            self.assertTrue(self.server.should_search("docker 集群选型", "customer_needs", {}))
+            self.assertTrue(self.server.should_search("Saas 订阅", "customer_needs", {}))
+            self.assertTrue(self.server.should_search("KUBERNETES", "customer_needs", {}))
+            self.assertFalse(self.server.should_search("团队周会安排", "customer_needs", {}))
+            self.assertTrue(self.server.should_search("团队周会安排", "tech_constraints", {}))
+        with mock.patch.object(self.server, "ENABLE_WEB_SEARCH", False):
+            self.assertFalse(self.server.should_search("docker", "tech_constraints", {}))
+
     def test_build_prompt_limits_missing_aspects_by_interview_mode(self):
         original_missing_aspects = self.server.get_dimension_missing_aspects
         self.addCleanup(setattr, self.server, "get_dimension_missing_aspects", original_missing_aspects)
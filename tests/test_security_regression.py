@@ -909,6 +909,28 @@ class SecurityRegressionTests(unittest.TestCase):
         verified, verify_error = self.server.verify_sms_code(phone, "login", "222222", consume=True)
         self.assertTrue(verified, verify_error)
 
+    def test_ensure_user_for_phone_stores_unique_placeholder_password_hash(self):
+        from werkzeug.security import check_password_hash
+
+        first_phone = f"1{uuid.uuid4().int % 10**10:010d}"
+        second_phone = f"1{uuid.uuid4().int % 10**10:010d}"
+        first_user, first_created = self.server.ensure_user_for_phone(first_phone)
+        second_user, second_created = self.server.ensure_user_for_phone(second_phone)
+        self.assertTrue(first_created)
+        self.assertTrue(second_created)
+
+        with self.server.get_auth_db_connection() as conn:
+            rows = conn.execute(
+                "SELECT password_hash FROM users WHERE id IN (?, ?)",
+                (int(first_user["id"]), int(second_user["id"])),
+            ).fetchall()
+        hashes = [str(row["password_hash"]) for row in rows]
+        self.assertEqual(2, len(set(hashes)))
+        for password_hash in hashes:
+            self.assertTrue(password_hash.startswith("pbkdf2:sha256:1$"))
+            self.assertFalse(check_password_hash(password_hash, ""))
+            self.assertFalse(check_password_hash(password_hash, first_phone))
+
     def test_deleted_reports_sidecar_keeps_all_entries_under_parallel_updates(self):
         report_names = [f"parallel-delete-{idx}.md" for idx in range(12)]
         barrier = threading.Barrier(len(report_names))
@@ -1451,6 +1473,61 @@ class SecurityRegressionTests(unittest.TestCase):
         self.assertTrue(parse_meta.get("repair_applied"))
         self.assertEqual(parsed.get("revised_draft", {}).get("overview"), "ok")
 
+    def test_extract_first_json_object_skips_braces_in_strings_and_escapes(self):
+        extract = self.server._extract_first_json_object
+        self.assertEqual(
+            '{"q": "括号 {不计数} 与 \\"引号\\"", "n": {"a": [1, 2]}}',
+            extract('前言 {"q": "括号 {不计数} 与 \\"引号\\"", "n": {"a": [1, 2]}} 尾巴 {"x": 1}'),
+        )
+        self.assertEqual('{"path": "C:\\\\"}', extract('```json\n{"path": "C:\\\\"}\n```'))
+        self.assertIsNone(extract('{"unclosed": "}'))
+        self.assertIsNone(extract("没有 JSON"))
+        self.assertIsNone(extract(""))
+
+    def test_parse_structured_json_response_skips_duplicate_attempt_texts(self):
+        parse_meta = {}
+        parsed = self.server.parse_structured_json_response(
+            '{"overview": "ok"} 以上为草稿说明',
+            required_keys=["needs"],
+            require_all_keys=True,
+            parse_meta=parse_meta,
+        )
+        self.assertIsNone(parsed)
+        self.assertEqual(2, parse_meta.get("candidate_count"))
+        # 原文失败 → 修复后截取首个对象；与 extract_first_object 候选相同的文本不再重复解析
+        self.assertEqual(2, parse_meta.get("parse_attempts"))
+        self.assertEqual(["needs"], parse_meta.get("missing_keys"))
+
+    def test_normalize_evidence_refs_accepts_mixed_case_and_dedups_in_numeric_order(self):
+        normalize = self.server._normalize_evidence_refs
+        self.assertEqual(["Q2", "Q10", "Q11"], normalize("见 q10、Q2，以及 q11 / Q10"))
+        self.assertEqual(["Q1", "Q3"], normalize(["q3", "Q1,Q3", 7, None]))
+        self.assertEqual(["Q1", "Q3"], normalize(["Q01", "q1", "Q003"]))
+        self.assertEqual([], normalize("无编号"))
+        self.assertEqual([], normalize(None))
+
+    def test_normalize_evidence_refs_copies_canonical_lists_and_normalizes_near_misses(self):
+        normalize = self.server._normalize_evidence_refs
+        canonical = ["Q1", "Q2", "Q10"]
+        result = normalize(canonical)
+        self.assertEqual(canonical, result)
+        self.assertIsNot(canonical, result)
+        self.assertEqual([], normalize([]))
+        cases = [
+            (["Q10", "Q2"], ["Q2", "Q10"]),
+            (["Q2", "Q2"], ["Q2"]),
+            (["Q02", "Q3"], ["Q2", "Q3"]),
+            (["q1", "Q2"], ["Q1", "Q2"]),
+            (["Q1 ", "Q2"], ["Q1", "Q2"]),
+            (["Q1,Q3"], ["Q1", "Q3"]),
+            (["Q0"], ["Q0"]),
+            (["Q１"], ["Q1"]),
+            (["Q1", 2], ["Q1"]),
+        ]
+        for raw_refs, expected in cases:
+            with self.subTest(raw_refs=raw_refs):
+                self.assertEqual(expected, normalize(raw_refs))
+
     def test_merge_report_draft_patch_v3_preserves_unmodified_sections(self):
         base_draft = {
             "overview": "旧概述",
@@ -2633,6 +2710,74 @@ class SecurityRegressionTests(unittest.TestCase):
             for key, value in fn_backup.items():
                 setattr(self.server, key, value)
 
+    def test_run_report_generation_job_simple_template_fallback_reuses_v3_evidence_pack(self):
+        user = self._register_user()
+        standard_code = self._generate_license_batch(level_key="standard", note="模板回退证据包复用")["licenses"][0]["code"]
+        self._activate_license(standard_code)
+        session_id = self._create_session(topic="模板回退证据包复用")
+
+        fn_keys = [
+            "resolve_ai_client",
+            "get_release_conservative_report_short_circuit_meta",
+            "generate_report_v3_pipeline",
+            "attempt_salvage_v3_review_failure",
+            "build_report_prompt_with_options",
+            "call_claude",
+            "generate_interview_appendix",
+            "build_report_quality_meta_fallback",
+        ]
+        fn_backup = {key: getattr(self.server, key) for key in fn_keys}
+        old_template_fallback = getattr(self.server, "REPORT_SIMPLE_TEMPLATE_FALLBACK_ENABLED", None)
+        v3_evidence_pack = {"facts": [{"q_id": "Q1"}], "overall_coverage": 0.5}
+        fallback_calls = []
+        try:
+            self.server.REPORT_SIMPLE_TEMPLATE_FALLBACK_ENABLED = True
+            self.server.resolve_ai_client = lambda *args, **kwargs: object()
+            self.server.get_release_conservative_report_short_circuit_meta = lambda *_args, **_kwargs: {"triggered": False}
+            self.server.generate_report_v3_pipeline = lambda *_args, **_kwargs: {
+                "status": "failed",
+                "reason": "exception",
+                "error": "simulated upstream failure",
+                "parse_stage": "draft_generation",
+                "failure_stage": "draft_generation",
+                "evidence_pack": v3_evidence_pack,
+            }
+            self.server.attempt_salvage_v3_review_failure = lambda *_args, **_kwargs: {
+                "attempted": False,
+                "success": False,
+                "note": "not_applicable",
+            }
+            self.server.build_report_prompt_with_options = lambda *_args, **_kwargs: "legacy prompt"
+            self.server.call_claude = lambda *_args, **_kwargs: ""
+            self.server.generate_interview_appendix = lambda _session: ""
+
+            def _record_fallback(_session, mode, evidence_pack=None):
+                fallback_calls.append((mode, evidence_pack))
+                return {"mode": mode}
+
+            self.server.build_report_quality_meta_fallback = _record_fallback
+
+            self.server.run_report_generation_job(
+                session_id,
+                int(user["id"]),
+                "req-template-evidence-pack",
+                "balanced",
+                "generate",
+                "",
+            )
+
+            self.assertEqual([("simple_template_fallback", v3_evidence_pack)], fallback_calls)
+        finally:
+            if old_template_fallback is None:
+                try:
+                    delattr(self.server, "REPORT_SIMPLE_TEMPLATE_FALLBACK_ENABLED")
+                except AttributeError:
+                    pass
+            else:
+                self.server.REPORT_SIMPLE_TEMPLATE_FALLBACK_ENABLED = old_template_fallback
+            for key, value in fn_backup.items():
+                setattr(self.server, key, value)
+
     def test_filter_model_review_issues_v3_skips_hallucinated_template_rules(self):
         draft = {
             "overview": "ok",
@@ -2977,6 +3122,26 @@ class SecurityRegressionTests(unittest.TestCase):
         filtered = self.server.filter_model_review_issues_v3(model_issues, draft, runtime_profile="balanced")
         self.assertEqual(filtered, [])
 
+    def test_merge_review_and_local_issues_v3_dedups_by_field_tuple(self):
+        local_issues = [
+            {"type": "Blindspot", "severity": "high", "message": "缺少盲区", "target": "open_questions"},
+            {"type": "blindspot", "severity": "low", "message": " 缺少盲区 ", "target": "open_questions"},
+            {"type": "custom|a", "severity": "medium", "message": "c", "target": "b"},
+            {"type": "custom", "severity": "medium", "message": "c", "target": "a|b"},
+        ]
+
+        merged, filtered = self.server.merge_review_and_local_issues_v3([], local_issues, {})
+
+        self.assertEqual(filtered, [])
+        self.assertEqual(
+            [(item["type"], item["target"], item["severity"]) for item in merged],
+            [
+                ("blindspot", "open_questions", "high"),
+                ("custom|a", "b", "medium"),
+                ("custom", "a|b", "medium"),
+            ],
+        )
+
     def test_filter_model_review_issues_v3_reclassifies_global_no_evidence_to_quality_gate_issue(self):
         draft = {
             "overview": "ok",
@@ -3828,6 +3993,55 @@ class SecurityRegressionTests(unittest.TestCase):
         self.assertEqual(meta.get("claim_with_evidence"), 1)
         self.assertAlmostEqual(meta.get("evidence_coverage"), 1.0, places=3)
 
+    def test_compute_report_quality_meta_v3_counts_actionability_including_items_without_refs(self):
+        draft = {
+            "overview": "概述",
+            "needs": [{"name": "需求A", "priority": "P1", "description": "描述", "evidence_refs": ["Q1"]}],
+            "analysis": {},
+            "visualizations": {},
+            "solutions": [
+                {"title": "方案A", "owner": "张三", "timeline": "2周", "metric": "完成率", "evidence_refs": ["Q1"]},
+                {"title": "方案B", "owner": "王五", "timeline": "1月", "metric": "转化率", "evidence_refs": []},
+            ],
+            "risks": [{"risk": "风险A", "owner": "张三", "timeline": "1周", "metric": "发生率", "evidence_refs": ["Q1"]}],
+            "actions": [
+                {"action": "行动A", "owner": "李四", "timeline": "", "metric": "完成", "evidence_refs": ["Q1"]},
+                {"action": "行动B", "owner": " ", "timeline": "1周", "metric": "完成"},
+            ],
+            "open_questions": [],
+            "evidence_index": [],
+        }
+        evidence_pack = {"facts": [{"q_id": "Q1"}], "contradictions": [], "unknowns": [], "blindspots": []}
+        meta = self.server.compute_report_quality_meta_v3(draft, evidence_pack, [])
+        self.assertEqual(6, meta.get("claim_total"))
+        self.assertEqual(4, meta.get("claim_with_evidence"))
+        self.assertAlmostEqual(0.5, meta.get("actionability"), places=3)
+
+    def test_validate_report_draft_v3_sanitizes_list_field_texts_per_field(self):
+        evidence_pack = {"facts": [{"q_id": "Q1"}], "contradictions": [], "blindspots": []}
+        draft = {
+            "overview": "概述",
+            "needs": [{"name": "需求A", "priority": "P1", "description": "描述", "evidence_refs": ["Q1"]}],
+            "solutions": [{"title": " 方案A ", "owner": " 张三 [证据:Q1]", "timeline": "", "metric": "完成率", "evidence_refs": ["Q1"]}],
+            "risks": [{"risk": "风险A", "impact": " 高 ", "mitigation": "规避（证据:Q1）", "evidence_refs": ["Q1"]}],
+            "actions": [],
+            "open_questions": [{"question": "问题A", "reason": " 未确认 ", "evidence_refs": []}],
+            "evidence_index": [{"claim": "结论A", "confidence": "HIGH", "evidence_refs": ["Q1"]}],
+        }
+        normalized, issues = self.server.validate_report_draft_v3(draft, evidence_pack)
+        solution = normalized["solutions"][0]
+        self.assertEqual(("方案A", "张三", "", "完成率"), (solution["title"], solution["owner"], solution["timeline"], solution["metric"]))
+        self.assertEqual(("高", "规避"), (normalized["risks"][0]["impact"], normalized["risks"][0]["mitigation"]))
+        self.assertNotIn("owner", normalized["risks"][0])
+        open_question = normalized["open_questions"][0]
+        self.assertEqual(("未确认", "", ""), (open_question["reason"], open_question["impact"], open_question["suggested_follow_up"]))
+        self.assertEqual("pending_follow_up", open_question["evidence_binding_mode"])
+        self.assertEqual("high", normalized["evidence_index"][0]["confidence"])
+        self.assertEqual(
+            [("not_actionable", "solutions[0]")],
+            [(item["type"], item["target"]) for item in issues if item["type"] == "not_actionable"],
+        )
+
     def test_validate_report_draft_v3_defaults_binding_mode_when_refs_present(self):
         evidence_pack = {"facts": [{"q_id": "Q1"}], "contradictions": [], "blindspots": []}
         draft = {
@@ -3848,6 +4062,318 @@ class SecurityRegressionTests(unittest.TestCase):
         self.assertEqual("strong_explicit", normalized["risks"][0].get("evidence_binding_mode"))
         self.assertEqual("strong_explicit", normalized["actions"][0].get("evidence_binding_mode"))
 
+    def test_validate_report_draft_v3_accepts_only_well_formed_fact_ids(self):
+        evidence_pack = {
+            "facts": [{"q_id": " q2 "}, {"q_id": "Q3x"}, "Q4", {"q_id": "Q5"}],
+            "contradictions": [],
+            "blindspots": [],
+        }
+        draft = {
+            "overview": "概述",
+            "needs": [{"name": "需求A", "priority": "P1", "description": "描述", "evidence_refs": ["Q2", "Q3", "Q4", "q5"]}],
+        }
+        normalized, issues = self.server.validate_report_draft_v3(draft, evidence_pack)
+        self.assertEqual(["Q2", "Q5"], normalized["needs"][0]["evidence_refs"])
+        invalid_messages = [item["message"] for item in issues if item.get("type") == "invalid_evidence_ref"]
+        self.assertEqual(["包含无效证据引用：Q3, Q4"], invalid_messages)
+
+    def test_summarize_evidence_pack_for_debug_coerces_dimension_fields(self):
+        evidence_pack = {
+            "facts": [{"q_id": "Q1"}, {"q_id": "Q2"}],
+            "dimension_coverage": {
+                "customer_needs": {"name": "客户需求", "coverage_percent": "75", "formal_count": 3, "missing_aspects": "角色"},
+                "tech_constraints": {"coverage_percent": None, "question_count_coverage_percent": 40, "missing_aspects": [str(i) for i in range(10)]},
+                "broken": "invalid",
+            },
+            "quality_snapshot": "invalid",
+        }
+        summary = self.server.summarize_evidence_pack_for_debug(evidence_pack)
+        self.assertEqual(2, summary["facts_count"])
+        self.assertEqual(["customer_needs", "tech_constraints"], list(summary["dimension_coverage"].keys()))
+        customer = summary["dimension_coverage"]["customer_needs"]
+        self.assertEqual(75, customer["coverage_percent"])
+        self.assertEqual(75, customer["question_count_coverage_percent"])
+        self.assertEqual([], customer["missing_aspects"])
+        tech = summary["dimension_coverage"]["tech_constraints"]
+        self.assertEqual("tech_constraints", tech["name"])
+        self.assertEqual(0, tech["coverage_percent"])
+        self.assertEqual(40, tech["question_count_coverage_percent"])
+        self.assertEqual([str(i) for i in range(8)], tech["missing_aspects"])
+        self.assertEqual(0.0, summary["quality_snapshot"]["average_quality_score"])
+
+    def test_collect_valid_fact_refs_normalizes_each_fact_id_once(self):
+        evidence_pack = {"facts": [{"q_id": " q2 "}, {"q_id": "Q3x"}, "Q4", {"q_id": None}, {"q_id": "Q5"}]}
+        self.assertEqual({"Q2", "Q5"}, self.server._collect_valid_fact_refs(evidence_pack))
+        self.assertEqual(set(), self.server._collect_valid_fact_refs({"facts": "Q1"}))
+        self.assertEqual(set(), self.server._collect_valid_fact_refs(None))
+
+    def test_follow_up_budget_status_counts_only_follow_ups_after_last_formal_question(self):
+        session = {
+            "interview_mode": "standard",
+            "interview_log": [
+                {"dimension": "customer_needs", "is_follow_up": True},
+                {"dimension": "customer_needs", "is_follow_up": False},
+                {"dimension": "customer_needs", "is_follow_up": True},
+                {"dimension": "business_process", "is_follow_up": True},
+                {"dimension": "customer_needs", "is_follow_up": False},
+                {"dimension": "customer_needs", "is_follow_up": True},
+                {"dimension": "business_process", "is_follow_up": False},
+                {"dimension": "customer_needs", "is_follow_up": True},
+            ],
+        }
+        status = self.server.get_follow_up_budget_status(session, "customer_needs")
+        self.assertEqual(5, status["total_used"])
+        self.assertEqual(4, status["dimension_used"])
+        self.assertEqual(2, status["current_question_used"])
+
+        orphan_status = self.server.get_follow_up_budget_status(
+            {"interview_log": [{"dimension": "tech_constraints", "is_follow_up": True}]},
+            "tech_constraints",
+        )
+        self.assertEqual(1, orphan_status["dimension_used"])
+        self.assertEqual(0, orphan_status["current_question_used"])
+
+    def test_interview_metric_memo_reuses_results_within_scope_and_invalidates_on_append(self):
+        session = {
+            "interview_mode": "standard",
+            "interview_log": [
+                {"dimension": "customer_needs", "question": "痛点是什么？", "answer": "审批慢", "is_follow_up": False},
+            ],
+        }
+        with self.server.interview_metric_memo_scope():
+            first = self.server.calculate_dimension_saturation(session, "customer_needs")
+            first["covered_aspects"].append("被调用方修改")
+            second = self.server.calculate_dimension_saturation(session, "customer_needs")
+            self.assertNotIn("被调用方修改", second["covered_aspects"])
+            self.assertEqual(first["saturation_score"], second["saturation_score"])
+
+            session["interview_log"].append(
+                {"dimension": "customer_needs", "question": "预算？", "answer": "预算 50 万，因为要覆盖 3 个部门", "is_follow_up": False}
+            )
+            refreshed = self.server.calculate_dimension_saturation(session, "customer_needs")
+            self.assertGreater(refreshed["volume_score"], second["volume_score"])
+
+        self.assertIsNone(getattr(self.server.interview_metric_memo_local, "memo", None))
+
+    def test_interview_metric_memo_does_not_reuse_results_of_released_sessions(self):
+        answers = ["审批慢", "预算 50 万，因为要覆盖 3 个部门；比如财务、采购、行政"] * 10
+        expected = [
+            self.server.calculate_dimension_saturation(
+                {"interview_log": [{"dimension": "customer_needs", "question": "痛点？", "answer": answer}]},
+                "customer_needs",
+            )["saturation_score"]
+            for answer in answers
+        ]
+        with self.server.interview_metric_memo_scope():
+            actual = [
+                self.server.calculate_dimension_saturation(
+                    {"interview_log": [{"dimension": "customer_needs", "question": "痛点？", "answer": answer}]},
+                    "customer_needs",
+                )["saturation_score"]
+                for answer in answers
+            ]
+        self.assertEqual(expected, actual)
+
+    def test_answer_depth_and_saturation_keyword_signals_are_stable(self):
+        cases = [
+            ("看情况吧", ["too_short", "vague_expression", "no_quantification"], 0.55),
+            ("不知道，目前还不好说", ["too_short", "vague_expression", "no_quantification"], 0.55),
+            ("好的", ["too_short", "generic_answer", "no_quantification"], 0.7),
+            ("需要对接 ERP，但也不需要实时同步", ["too_short", "no_quantification", "contradiction_detected"], 0.6),
+            ("预算 50 万，因为要覆盖 3 个部门；比如财务、采购", ["too_short"], 0.2),
+        ]
+        for answer, expected_signals, expected_score in cases:
+            with self.subTest(answer=answer):
+                result = self.server.evaluate_answer_depth("问题？", answer, "tech_constraints")
+                self.assertEqual(expected_signals, result["signals"])
+                self.assertEqual(expected_score, result["follow_up_score"])
+
+        depth_cases = [
+            ("预算 50 万，因为要覆盖 3 个部门；比如财务、采购", 0.8),
+            ("我们优先保证稳定性，而不是功能数量", 0.2),
+            ("审批流程太慢，经常卡在财务环节导致项目延期两周以上", 0.0),
+        ]
+        for answer, expected_depth in depth_cases:
+            with self.subTest(answer=answer):
+                saturation = self.server.calculate_dimension_saturation(
+                    {"interview_log": [{"dimension": "customer_needs", "question": "痛点？", "answer": answer}]},
+                    "customer_needs",
+                )
+                self.assertEqual(expected_depth, saturation["depth_score"])
+
+    def test_get_dimension_logs_groups_once_within_memo_scope(self):
+        session = {
+            "interview_log": [
+                {"dimension": "customer_needs", "question": "痛点？", "answer": "审批慢", "is_follow_up": False},
+                {"dimension": "business_flow", "question": "流程？", "answer": "先提单", "is_follow_up": False},
+            ],
+        }
+        with self.server.interview_metric_memo_scope():
+            first = self.server.get_dimension_logs(session, "customer_needs")
+            first.append({"dimension": "customer_needs", "answer": "调用方追加"})
+            self.assertEqual(1, len(self.server.get_dimension_logs(session, "customer_needs")))
+            self.assertEqual([], self.server.get_dimension_logs(session, "tech_constraints"))
+
+            session["interview_log"].append(
+                {"dimension": "customer_needs", "question": "频率？", "answer": "每天", "is_follow_up": True}
+            )
+            self.assertEqual(2, len(self.server.get_dimension_logs(session, "customer_needs")))
+            self.assertEqual(1, len(self.server.get_dimension_logs(session, "business_flow")))
+
+        self.assertEqual(2, len(self.server.get_dimension_logs(session, "customer_needs")))
+
+    def test_interview_mode_config_merges_v2_overrides_once(self):
+        for mode in ("quick", "standard", "deep"):
+            with self.subTest(mode=mode):
+                expected = {**self.server.INTERVIEW_MODES[mode], **self.server.INTERVIEW_MODES_V2[mode]}
+                config = self.server.get_interview_mode_config({"interview_mode": mode})
+                self.assertEqual(expected, config)
+                self.assertIs(
+                    self.server._get_shared_interview_mode_config({"interview_mode": mode}),
+                    self.server._get_shared_interview_mode_config({"interview_mode": mode}),
+                )
+                config["formal_questions_per_dim"] = -1
+                self.assertEqual(
+                    expected["formal_questions_per_dim"],
+                    self.server.get_interview_mode_config({"interview_mode": mode})["formal_questions_per_dim"],
+                )
+                self.assertEqual(expected, self.server._get_shared_interview_mode_config({"interview_mode": mode}))
+
+                display = self.server.get_interview_mode_display_config(mode)
+                self.assertEqual(expected, display)
+                display["name"] = "调用方修改"
+                self.assertNotEqual("调用方修改", self.server.get_interview_mode_config({"interview_mode": mode}).get("name"))
+
+        self.assertEqual(
+            self.server.get_interview_mode_config({"interview_mode": "standard"}),
+            self.server.get_interview_mode_config({"interview_mode": "unknown"}),
+        )
+
+    def test_calculate_dimension_saturation_volume_counts_answer_chars_only(self):
+        session = {
+            "interview_log": [
+                {"dimension": "customer_needs", "question": "问" * 50, "answer": "答" * 60},
+                {"dimension": "customer_needs", "question": "问" * 50, "answer": "答" * 45},
+                {"dimension": "business_flow", "question": "问", "answer": "答" * 300},
+            ],
+        }
+        saturation = self.server.calculate_dimension_saturation(session, "customer_needs")
+        self.assertEqual(0.35, saturation["volume_score"])
+
+    def test_calculate_all_dimension_saturations_matches_per_dimension_results(self):
+        session = {
+            "interview_mode": "standard",
+            "interview_log": [
+                {"dimension": "customer_needs", "question": "痛点？", "answer": "审批慢，因为要 3 个部门签字", "is_follow_up": False},
+                {"dimension": "business_flow", "question": "流程？", "answer": "先提单再审批，比如报销", "is_follow_up": False},
+                {"dimension": "customer_needs", "question": "影响？", "answer": "每月延误 2 次", "is_follow_up": True},
+            ],
+        }
+        saturations = self.server.calculate_all_dimension_saturations(session)
+        self.assertEqual(self.server.get_dimension_order_for_session(session), list(saturations.keys()))
+        for dim_key, saturation in saturations.items():
+            with self.subTest(dimension=dim_key):
+                self.assertEqual(self.server.calculate_dimension_saturation(session, dim_key), saturation)
+
+    def test_calculate_user_fatigue_counts_recent_short_and_option_only_answers(self):
+        long_answer = "我们目前主要依靠人工录入订单，再由主管逐条核对库存与账期，整个流程大约需要两天"
+        session = {
+            "interview_mode": "standard",
+            "interview_log": [
+                {"dimension": "customer_needs", "question": "背景？", "answer": long_answer, "options": []},
+                {"dimension": "customer_needs", "question": "频率？", "answer": "每天", "options": ["每天", "每周"]},
+                {"dimension": "customer_needs", "question": "角色？", "answer": "主管", "options": ["主管", "专员"]},
+                {"dimension": "customer_needs", "question": "渠道？", "answer": "线下", "options": ["线上", "线下"]},
+                {"dimension": "customer_needs", "question": "补充？", "answer": "暂时没有", "options": []},
+            ],
+        }
+
+        fatigue = self.server.calculate_user_fatigue(session, "customer_needs")
+
+        self.assertEqual(["consecutive_short", "option_only_streak"], fatigue["detected_signals"])
+        self.assertEqual(0.55, fatigue["fatigue_score"])
+        self.assertFalse(fatigue["should_force_progress"])
+
+        session["interview_log"][2]["answer"] = long_answer
+        fatigue = self.server.calculate_user_fatigue(session, "customer_needs")
+        self.assertEqual(["consecutive_short"], fatigue["detected_signals"])
+
+        session["interview_log"] = [
+            {"dimension": "customer_needs", "question": f"问题{i}？", "answer": "是", "options": ["是", "否"]}
+            for i in range(25)
+        ]
+        fatigue = self.server.calculate_user_fatigue(session, "customer_needs")
+        self.assertEqual(
+            ["consecutive_short", "option_only_streak", "same_dimension_too_long", "total_questions_high"],
+            fatigue["detected_signals"],
+        )
+        self.assertEqual(1.0, fatigue["fatigue_score"])
+        self.assertTrue(fatigue["should_force_progress"])
+
+    def test_dimension_metrics_accept_prefiltered_dim_logs(self):
+        session = {
+            "interview_mode": "standard",
+            "interview_log": [
+                {"dimension": "customer_needs", "question": "痛点？", "answer": "审批慢，因为要 3 个部门签字", "is_follow_up": False, "hard_triggered": True},
+                {"dimension": "business_flow", "question": "流程？", "answer": "先提单再审批", "is_follow_up": False},
+            ],
+        }
+        dim_logs = [log for log in session["interview_log"] if log["dimension"] == "customer_needs"]
+        self.assertEqual(
+            self.server.calculate_dimension_saturation(session, "customer_needs"),
+            self.server.calculate_dimension_saturation(session, "customer_needs", dim_logs=dim_logs),
+        )
+        self.assertEqual(
+            self.server.calculate_user_fatigue(session, "customer_needs"),
+            self.server.calculate_user_fatigue(session, "customer_needs", dim_logs=dim_logs),
+        )
+        self.assertTrue(self.server.has_pending_forced_follow_up(session, "customer_needs", dim_logs=dim_logs))
+
+        completion = self.server.evaluate_dimension_completion_v2(session, "customer_needs")
+        self.assertEqual("continue", completion["action"])
+        self.assertEqual(1, completion["snapshot"]["formal_count"])
+        self.assertTrue(completion["snapshot"]["pending_forced_follow_up"])
+        self.assertNotIn("saturation", completion["snapshot"])
+
+    def test_evaluate_dimension_completion_v2_skips_text_metrics_until_formal_gate_passes(self):
+        session = {
+            "interview_mode": "standard",
+            "interview_log": [
+                {"dimension": "customer_needs", "question": "痛点？", "answer": "审批慢", "is_follow_up": False},
+            ],
+        }
+        original_saturation = self.server.calculate_dimension_saturation
+
+        def fail_saturation(*_args, **_kwargs):
+            raise AssertionError("不应计算饱和度")
+
+        self.server.calculate_dimension_saturation = fail_saturation
+        try:
+            completion = self.server.evaluate_dimension_completion_v2(session, "customer_needs")
+        finally:
+            self.server.calculate_dimension_saturation = original_saturation
+        self.assertEqual("continue", completion["action"])
+        self.assertIn("正式问题数量不足", completion["reason"])
+
+        min_formal = self.server.get_interview_mode_config(session)["formal_questions_per_dim"]
+        session["interview_log"] = [
+            {"dimension": "customer_needs", "question": f"问题{idx}？", "answer": "审批慢，因为要 3 个部门签字", "is_follow_up": False}
+            for idx in range(min_formal)
+        ]
+        completion = self.server.evaluate_dimension_completion_v2(session, "customer_needs")
+        self.assertEqual(min_formal, completion["snapshot"]["formal_count"])
+        self.assertEqual(
+            self.server.get_dimension_missing_aspects(session, "customer_needs"),
+            completion["snapshot"]["missing_aspects"],
+        )
+
+    def test_evaluate_answer_depth_detects_ascii_and_fullwidth_digits(self):
+        for answer, expected in (("预算 50 万左右", True), ("预算５０万左右", True), ("预算五十万左右", False)):
+            with self.subTest(answer=answer):
+                result = self.server.evaluate_answer_depth("预算是多少？", answer, "project_constraints")
+                self.assertIs(expected, result["has_numbers"])
+                self.assertEqual(not expected, "no_quantification" in result["signals"])
+
     def test_evaluate_answer_depth_does_not_penalize_single_select_answer_as_single_selection(self):
         result = self.server.evaluate_answer_depth(
             question="您当前最关注的场景是哪一个？",
@@ -3860,6 +4386,19 @@ class SecurityRegressionTests(unittest.TestCase):
         self.assertNotIn("single_selection", result.get("signals", []))
         self.assertNotIn("option_only", result.get("signals", []))
 
+    def test_evaluate_answer_depth_flags_multi_select_with_at_most_one_option(self):
+        options = ["售后", "营销", "风控", "物流"]
+        for answer, expected in (("售后", True), ("都不是", True), ("售后和营销", False), ("售后、营销、风控", False)):
+            with self.subTest(answer=answer):
+                result = self.server.evaluate_answer_depth(
+                    question="您关注哪些环节？",
+                    answer=answer,
+                    dimension="customer_needs",
+                    options=options,
+                    multi_select=True,
+                )
+                self.assertEqual(expected, "single_selection" in result.get("signals", []))
+
     def test_evaluate_answer_depth_pick_only_mode_does_not_require_extra_rationale(self):
         result = self.server.evaluate_answer_depth(
             question="当前最优先的目标是什么？",
@@ -3890,6 +4429,26 @@ class SecurityRegressionTests(unittest.TestCase):
         self.assertIn("rich_option_answer", result.get("signals", []))
         self.assertNotIn("missing_rationale", result.get("signals", []))
 
+    def test_evaluate_answer_depth_rich_option_offset_depends_on_evidence_intent(self):
+        scores = {}
+        for intent in ("high", "medium"):
+            scores[intent] = self.server.evaluate_answer_depth(
+                question="当前最优先的目标是什么？",
+                answer="审批链条长导致整体处理慢",
+                dimension="customer_needs",
+                options=["审批链条长导致整体处理慢", "降低成本", "减少风险"],
+                answer_mode="pick_with_reason",
+                requires_rationale=True,
+                evidence_intent=intent,
+            )["follow_up_score"]
+        self.assertAlmostEqual(0.07, scores["medium"] - scores["high"], places=2)
+        self.assertEqual(
+            "回答包含模糊表述，需要明确具体要求",
+            self.server._build_follow_up_reason(["rich_option_answer", "vague_expression", "too_short"]),
+        )
+        self.assertEqual("需要进一步了解详细需求", self.server._build_follow_up_reason(["rich_option_answer"]))
+        self.assertEqual("需要进一步了解详细需求", self.server._build_follow_up_reason([]))
+
     def test_build_report_evidence_pack_does_not_mark_informative_option_answer_as_unknown(self):
         quality_eval = self.server.evaluate_answer_quality(
             eval_result=self.server.evaluate_answer_depth(
@@ -3934,6 +4493,29 @@ class SecurityRegressionTests(unittest.TestCase):
         self.assertEqual([], evidence_pack.get("unknowns", []))
         self.assertEqual("rich_option", evidence_pack["facts"][0].get("answer_evidence_class"))
 
+    def test_build_report_evidence_pack_detects_vague_answers_and_contradictions(self):
+        session = {
+            "topic": "测试",
+            "scenario_config": {"report": {"type": "standard"}},
+            "dimensions": {"customer_needs": {"coverage": 100}},
+            "interview_log": [
+                {"dimension": "customer_needs", "question": "单点登录是否为硬性要求？", "answer": "必须接入集团统一身份认证，销售外出时也要能登录", "is_follow_up": False},
+                {"dimension": "customer_needs", "question": "一期范围？", "answer": "单点登录在一期是可选的，以后再说", "is_follow_up": False},
+                {"dimension": "customer_needs", "question": "数据是否就绪？", "answer": "主数据已经梳理完成，但接口文档还没整理", "is_follow_up": False},
+            ],
+        }
+
+        evidence_pack = self.server.build_report_evidence_pack(session)
+
+        vague_unknowns = [item for item in evidence_pack["unknowns"] if "回答存在模糊表述" in item["reason"]]
+        self.assertEqual(["Q2"], [item["q_id"] for item in vague_unknowns])
+        conflicts = {
+            (item["type"], item["pair_id"], tuple(item["evidence_refs"]))
+            for item in evidence_pack["contradictions"]
+        }
+        self.assertIn(("cross_answer_conflict", "must", ("Q1", "Q2")), conflicts)
+        self.assertIn(("same_answer_conflict", "ready", ("Q3",)), conflicts)
+
     def test_backfill_session_interview_log_evidence_annotations_enriches_legacy_logs(self):
         session = {
             "topic": "历史会话",
@@ -4759,6 +5341,38 @@ class SecurityRegressionTests(unittest.TestCase):
             for key, value in backup.items():
                 setattr(self.server, key, value)
 
+    def test_recognize_scenario_reuses_cached_ai_result_for_same_prompt(self):
+        class _ScenarioMessages:
+            def __init__(self):
+                self.calls = 0
+
+            def create(self, **kwargs):
+                self.calls += 1
+                prompt = kwargs["messages"][0]["content"]
+                scenario_id = prompt.split("- id: ", 1)[1].split(",", 1)[0]
+                text = json.dumps({"scenario_id": scenario_id, "confidence": 0.9, "reason": "命中"}, ensure_ascii=False)
+                return types.SimpleNamespace(content=[{"type": "text", "text": text}])
+
+        scenario_client = types.SimpleNamespace(messages=_ScenarioMessages())
+        backup_resolver = self.server.resolve_ai_client
+        self.server.scenario_recognition_cache.clear()
+        self.addCleanup(self.server.scenario_recognition_cache.clear)
+        try:
+            self.server.resolve_ai_client = lambda *args, **kwargs: scenario_client
+            self._register_user()
+            payload = {"topic": "客户流失原因访谈", "description": "面向续费客户"}
+
+            first = self.client.post("/api/scenarios/recognize", json=payload)
+            second = self.client.post("/api/scenarios/recognize", json=payload)
+            self.assertEqual(200, first.status_code)
+            self.assertEqual(first.get_json()["recommended"], second.get_json()["recommended"])
+            self.assertEqual(1, scenario_client.messages.calls)
+
+            self.client.post("/api/scenarios/recognize", json={"topic": "供应链排产访谈"})
+            self.assertEqual(2, scenario_client.messages.calls)
+        finally:
+            self.server.resolve_ai_client = backup_resolver
+
     def test_call_claude_switches_to_question_lane_when_report_cooled(self):
         class _DummyMessages:
             def __init__(self, text: str):
@@ -5167,6 +5781,25 @@ class SecurityRegressionTests(unittest.TestCase):
         finally:
             self.server.REPORT_V3_RENDER_MERMAID_FROM_DATA = old_flag
 
+    def test_render_report_from_draft_v3_priority_matrix_falls_back_to_p1_anchor(self):
+        old_flag = self.server.REPORT_V3_RENDER_MERMAID_FROM_DATA
+        try:
+            self.server.REPORT_V3_RENDER_MERMAID_FROM_DATA = True
+
+            def render_point(priority):
+                draft = {"overview": "概述", "needs": [{"name": "需求A", "priority": priority, "evidence_refs": ["Q1"]}]}
+                report = self.server.render_report_from_draft_v3({"topic": "矩阵测试"}, draft, {})
+                return [line.strip() for line in report.splitlines() if line.strip().startswith("Req1:")]
+
+            p1_point = render_point("P1")
+            self.assertEqual(1, len(p1_point))
+            self.assertEqual(p1_point, render_point("p1"))
+            self.assertEqual(p1_point, render_point("P9"))
+            self.assertEqual(p1_point, render_point(None))
+            self.assertNotEqual(p1_point, render_point("P0"))
+        finally:
+            self.server.REPORT_V3_RENDER_MERMAID_FROM_DATA = old_flag
+
     def test_render_report_from_draft_v3_dispatches_assessment_and_custom_template(self):
         backup_assessment = self.server.render_report_from_draft_assessment_v1
         backup_custom = self.server.render_report_from_draft_custom_v1
@@ -5389,6 +6022,27 @@ class SecurityRegressionTests(unittest.TestCase):
         issue_types_without_refs = [item.get("type") for item in issues_without_refs if isinstance(item, dict)]
         self.assertIn("unresolved_contradiction", issue_types_without_refs)
 
+    def test_validate_report_draft_blindspot_check_matches_draft_text_case_insensitively(self):
+        evidence_pack = {
+            "facts": [{"q_id": "Q1"}],
+            "contradictions": [],
+            "blindspots": [{"dimension": "技术约束", "aspect": "SSO 集成"}, {"dimension": "项目约束", "aspect": "预算审批"}],
+        }
+        draft = {
+            "overview": "概述",
+            "needs": [{"name": "需求A", "priority": "P1", "description": "描述", "evidence_refs": ["Q1"]}],
+            "analysis": {"customer_needs": "分析", "business_flow": "分析", "tech_constraints": "分析", "project_constraints": "分析"},
+            "visualizations": {},
+            "solutions": [],
+            "risks": [],
+            "actions": [],
+            "open_questions": [{"question": "是否需要 sso 集成？", "reason": "未确认", "evidence_refs": []}],
+            "evidence_index": [],
+        }
+        _, issues = self.server.validate_report_draft_v3(draft, evidence_pack)
+        blindspot_messages = [item.get("message") for item in issues if item.get("type") == "blindspot"]
+        self.assertEqual(["仍有未覆盖盲区未进入草案：预算审批"], blindspot_messages)
+
     def test_wechat_start_blocks_external_return_to(self):
         old_enabled = self.server.WECHAT_LOGIN_ENABLED
         old_app_id = self.server.WECHAT_APP_ID
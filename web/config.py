@@ -83,6 +83,8 @@ SMART_SUMMARY_THRESHOLD = 1400
 SMART_SUMMARY_TARGET = 700
 # 作用：控制是否启用摘要结果缓存。
 SUMMARY_CACHE_ENABLED = True
+# 作用：控制智能摘要是否优先使用流式输出（仅首个增量前失败时回退普通调用；摘要仍在完整生成后返回，默认关闭）。
+SMART_SUMMARY_STREAM_ENABLED = False
 
 # ============ 问题生成链路 ===========
 # 控制快档、竞速、按 lane 覆盖以及问题链路的长尾优化。
@@ -364,6 +366,8 @@ QUESTION_PREFETCH_INFLIGHT_WAIT_SECONDS = 1.8
 QUESTION_PREFETCH_INFLIGHT_TTL_SECONDS = 120.0
 # 作用：设置提交答案后优先等待预生成结果的最长时间（秒）。
 QUESTION_SUBMIT_PREFETCH_WAIT_SECONDS = 3.0
+# 作用：设置并发请求同一问题时等待在途实时生成结果的最长时间（秒），超时后自行生成。
+QUESTION_GENERATION_INFLIGHT_WAIT_SECONDS = 20.0
 # 作用：设置摘要异步更新的最小触发间隔（秒）。
 SUMMARY_UPDATE_DEBOUNCE_SECONDS = 60
 # 作用：设置搜索决策缓存的保留时长（秒）。
@@ -386,6 +390,10 @@ SEARCH_RESULT_INFLIGHT_WAIT_SECONDS = 12.0
 INTERVIEW_PROMPT_CACHE_TTL_SECONDS = 120
 # 作用：设置访谈 Prompt 构建缓存允许保存的最大条目数。
 INTERVIEW_PROMPT_CACHE_MAX_ENTRIES = 256
+# 作用：设置场景识别 AI 结果缓存的保留时长（秒），0 表示关闭。
+SCENARIO_RECOGNITION_CACHE_TTL_SECONDS = 600
+# 作用：设置场景识别 AI 结果缓存允许保存的最大条目数。
+SCENARIO_RECOGNITION_CACHE_MAX_ENTRIES = 128
 # 作用：设置会话详情 payload 缓存的保留时长（秒）。
 SESSION_PAYLOAD_CACHE_TTL_SECONDS = 4.0
 # 作用：设置会话详情 payload 缓存允许保存的最大条目数。
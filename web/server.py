@@ -36,6 +36,7 @@ import subprocess
 import sys
 import threading
 import tempfile
+import traceback
 import time as _time
 import requests
 from functools import wraps
@@ -839,6 +840,9 @@ if QUESTION_PREFETCH_INFLIGHT_TTL_SECONDS < 1.0:
 QUESTION_SUBMIT_PREFETCH_WAIT_SECONDS = _cfg_float("QUESTION_SUBMIT_PREFETCH_WAIT_SECONDS", 3.0)
 if QUESTION_SUBMIT_PREFETCH_WAIT_SECONDS < QUESTION_PREFETCH_INFLIGHT_WAIT_SECONDS:
     QUESTION_SUBMIT_PREFETCH_WAIT_SECONDS = QUESTION_PREFETCH_INFLIGHT_WAIT_SECONDS
+QUESTION_GENERATION_INFLIGHT_WAIT_SECONDS = _cfg_float("QUESTION_GENERATION_INFLIGHT_WAIT_SECONDS", 20.0)
+if QUESTION_GENERATION_INFLIGHT_WAIT_SECONDS < 0.0:
+    QUESTION_GENERATION_INFLIGHT_WAIT_SECONDS = 0.0
 METRICS_ASYNC_FLUSH_INTERVAL_SECONDS = _cfg_float("METRICS_ASYNC_FLUSH_INTERVAL_SECONDS", 1.5)
 if METRICS_ASYNC_FLUSH_INTERVAL_SECONDS < 0.2:
     METRICS_ASYNC_FLUSH_INTERVAL_SECONDS = 0.2
@@ -854,6 +858,12 @@ if INTERVIEW_PROMPT_CACHE_TTL_SECONDS < 0:
 INTERVIEW_PROMPT_CACHE_MAX_ENTRIES = _cfg_int("INTERVIEW_PROMPT_CACHE_MAX_ENTRIES", 256)
 if INTERVIEW_PROMPT_CACHE_MAX_ENTRIES < 32:
     INTERVIEW_PROMPT_CACHE_MAX_ENTRIES = 32
+SCENARIO_RECOGNITION_CACHE_TTL_SECONDS = _cfg_int("SCENARIO_RECOGNITION_CACHE_TTL_SECONDS", 600)
+if SCENARIO_RECOGNITION_CACHE_TTL_SECONDS < 0:
+    SCENARIO_RECOGNITION_CACHE_TTL_SECONDS = 0
+SCENARIO_RECOGNITION_CACHE_MAX_ENTRIES = _cfg_int("SCENARIO_RECOGNITION_CACHE_MAX_ENTRIES", 128)
+if SCENARIO_RECOGNITION_CACHE_MAX_ENTRIES < 32:
+    SCENARIO_RECOGNITION_CACHE_MAX_ENTRIES = 32
 MAX_DOC_LENGTH = _cfg_int("MAX_DOC_LENGTH", 2000)         # 单个文档最大长度（字符）
 MAX_TOTAL_DOCS = _cfg_int("MAX_TOTAL_DOCS", 5000)         # 所有文档总长度限制（字符）
 QUESTION_FAST_LIGHT_DOC_BUDGET = _cfg_int(
@@ -2011,6 +2021,7 @@ ENABLE_SMART_SUMMARY = _cfg_bool("ENABLE_SMART_SUMMARY", True)
 SMART_SUMMARY_THRESHOLD = _cfg_int("SMART_SUMMARY_THRESHOLD", 1500)
 SMART_SUMMARY_TARGET = _cfg_int("SMART_SUMMARY_TARGET", 800)
 SUMMARY_CACHE_ENABLED = _cfg_bool("SUMMARY_CACHE_ENABLED", True)
+SMART_SUMMARY_STREAM_ENABLED = _cfg_bool("SMART_SUMMARY_STREAM_ENABLED", False)
 MAX_TOKENS_SUMMARY = _cfg_int("MAX_TOKENS_SUMMARY", 500)
 SEARCH_DECISION_FIRST_MAX_TOKENS = _cfg_int("SEARCH_DECISION_FIRST_MAX_TOKENS", 220)
 SEARCH_DECISION_FIRST_MAX_TOKENS = max(64, SEARCH_DECISION_FIRST_MAX_TOKENS)
@@ -3044,6 +3055,7 @@ ADMIN_CONFIG_SETTINGS_GROUPS: list[dict[str, Any]] = [
             _admin_int("SMART_SUMMARY_THRESHOLD", "智能摘要触发阈值"),
             _admin_int("SMART_SUMMARY_TARGET", "智能摘要目标长度"),
             _admin_bool("SUMMARY_CACHE_ENABLED", "启用摘要缓存"),
+            _admin_bool("SMART_SUMMARY_STREAM_ENABLED", "摘要流式输出"),
             _admin_int("SUMMARY_UPDATE_DEBOUNCE_SECONDS", "摘要更新防抖秒数"),
             _admin_int("MAX_DOC_LENGTH", "单文档最大长度"),
             _admin_int("MAX_TOTAL_DOCS", "参考资料总长度"),
@@ -3138,6 +3150,8 @@ ADMIN_CONFIG_SETTINGS_GROUPS: list[dict[str, Any]] = [
             _admin_int("SEARCH_DECISION_CACHE_TTL_SECONDS", "搜索决策缓存 TTL（秒）", advanced=True),
             _admin_int("INTERVIEW_PROMPT_CACHE_MAX_ENTRIES", "访谈 Prompt 缓存上限", advanced=True),
             _admin_int("INTERVIEW_PROMPT_CACHE_TTL_SECONDS", "访谈 Prompt 缓存 TTL（秒）", advanced=True),
+            _admin_int("SCENARIO_RECOGNITION_CACHE_MAX_ENTRIES", "场景识别缓存上限", advanced=True),
+            _admin_int("SCENARIO_RECOGNITION_CACHE_TTL_SECONDS", "场景识别缓存 TTL（秒）", advanced=True),
         ],
     },
     {
@@ -4251,6 +4265,10 @@ def _resolve_dynamic_question_lane_order(runtime_profile: Optional[dict], phase:
 interview_prompt_cache_lock = threading.Lock()
 interview_prompt_cache = {}  # { cache_key: { value: tuple[prompt, truncated_docs, decision_meta], expire_at: float } }
 
+# ============ 场景识别结果缓存 ============
+scenario_recognition_cache_lock = threading.Lock()
+scenario_recognition_cache = {}  # { cache_key: { value: dict, expire_at: float } }
+
 # ============ 首题预生成优先窗口 ============
 first_question_prefetch_priority_lock = threading.Lock()
 first_question_prefetch_priority = {}  # { session_id: deadline_ts }
@@ -5805,6 +5823,19 @@ def _is_upstream_rate_limit_error(error: Exception) -> bool:
     )
 
 
+def _is_upstream_timeout_error(error: Exception) -> bool:
+    if isinstance(error, TimeoutError):
+        return True
+    text = str(error or "").strip().lower()
+    if not text:
+        return False
+    return (
+        "timeout" in text
+        or "timed out" in text
+        or "超时" in text
+    )
+
+
 def build_compact_dimensions(dimensions: dict) -> dict:
     if not isinstance(dimensions, dict):
         return {}
@@ -8019,12 +8050,16 @@ def sync_session_index_and_bound_reports(session_file: Path, session_data: dict)
 def save_session_json_and_sync(session_file: Path, session_data: dict) -> tuple[int, int]:
     use_cloud_primary = _use_pure_cloud_session_storage()
     payload_text = _serialize_session_payload(session_data, compact=use_cloud_primary)
-    signature = (int(_time.time_ns()), len(payload_text.encode("utf-8")))
+    signature_time_ns = int(_time.time_ns())
+    signature = None
     session_id = str(session_data.get("session_id") or "").strip()
     file_name = session_file.name
     if not use_cloud_primary:
         _write_text_atomic(session_file, payload_text, encoding="utf-8")
-        signature = get_file_signature(session_file) or signature
+        signature = get_file_signature(session_file)
+    if signature is None:
+        # 本地文件签名已包含字节数，仅在云端主存储或取签名失败时才编码整份正文计算大小
+        signature = (signature_time_ns, len(payload_text.encode("utf-8")))
 
     try:
         record = {
@@ -12319,6 +12354,15 @@ def fetch_wechat_user_profile(access_token: str, openid: str) -> tuple[Optional[
     return payload, ""
 
 
+def build_placeholder_password_hash() -> str:
+    """为验证码/微信登录创建的账号生成占位密码哈希（password_hash 列非空）。
+
+    密码登录已下线，占位口令为 256 位随机串且从不外发，无需依赖迭代轮数抵御字典攻击；
+    这里保留 werkzeug pbkdf2 格式但只做 1 轮，避免每次建号多耗约 0.5 秒 CPU。
+    """
+    return generate_password_hash(secrets.token_urlsafe(32), method="pbkdf2:sha256:1")
+
+
 def resolve_user_for_wechat_identity(
     app_id: str,
     openid: str,
@@ -12379,8 +12423,6 @@ def resolve_user_for_wechat_identity(
                 identity_row = None
 
         if user_id is None:
-            import hashlib
-
             identity_seed = f"{app_id_value}:{unionid_value or openid_value}"
             identity_hash = hashlib.sha256(identity_seed.encode("utf-8")).hexdigest()[:24]
             shadow_email = f"wx_{identity_hash}@wechat.local"
@@ -12397,7 +12439,7 @@ def resolve_user_for_wechat_identity(
             if existing_shadow_user:
                 user_id = int(existing_shadow_user["id"])
             else:
-                random_password_hash = generate_password_hash(secrets.token_urlsafe(32), method="pbkdf2:sha256")
+                random_password_hash = build_placeholder_password_hash()
                 created = conn.execute(
                     """
                     INSERT INTO users (email, phone, password_hash, created_at, updated_at)
@@ -17607,10 +17649,9 @@ def web_search(query: str) -> list:
                 continue
             text = item.get("text", "")
             try:
-                import json as json_module
                 if text.startswith('"') and text.endswith('"'):
-                    text = json_module.loads(text)
-                search_data = json_module.loads(text)
+                    text = json.loads(text)
+                search_data = json.loads(text)
 
                 if isinstance(search_data, list):
                     for entry in search_data[:SEARCH_MAX_RESULTS]:
@@ -17656,7 +17697,6 @@ def web_search(query: str) -> list:
     except Exception as e:
         print(f"❌ MCP搜索失败: {e}")
         if ENABLE_DEBUG_LOG:
-            import traceback
             traceback.print_exc()
         return []
     finally:
@@ -17664,77 +17704,87 @@ def web_search(query: str) -> list:
         _end_search_inflight(cache_key, owner_event if is_owner_search else None)
 
 
-def should_search(topic: str, dimension: str, context: dict) -> bool:
-    """
-    规则预判：快速判断是否可能需要联网搜索（兜底规则）
-    返回 True 表示"可能需要"，后续会交给 AI 做最终判断
-    """
-    if not ENABLE_WEB_SEARCH:
-        return False
+# ========== 联网搜索规则预判关键词库 ==========
 
-    # ========== 扩展的关键词库 ==========
+# 技术关键词
+SEARCH_RULE_TECH_KEYWORDS = (
+    "技术", "系统", "平台", "框架", "工具", "软件", "应用", "架构",
+    "AI", "人工智能", "机器学习", "深度学习", "大模型", "LLM", "GPT",
+    "云", "SaaS", "PaaS", "IaaS", "微服务", "容器", "Docker", "K8s", "Kubernetes",
+    "数据库", "中间件", "API", "集成", "部署", "运维", "DevOps",
+    "前端", "后端", "全栈", "移动端", "App", "小程序"
+)
 
-    # 技术关键词
-    tech_keywords = [
-        "技术", "系统", "平台", "框架", "工具", "软件", "应用", "架构",
-        "AI", "人工智能", "机器学习", "深度学习", "大模型", "LLM", "GPT",
-        "云", "SaaS", "PaaS", "IaaS", "微服务", "容器", "Docker", "K8s", "Kubernetes",
-        "数据库", "中间件", "API", "集成", "部署", "运维", "DevOps",
-        "前端", "后端", "全栈", "移动端", "App", "小程序"
-    ]
+# 垂直行业关键词（新增）
+SEARCH_RULE_INDUSTRY_KEYWORDS = (
+    # 医疗健康
+    "医院", "医疗", "HIS", "LIS", "PACS", "EMR", "电子病历", "DRG", "医保",
+    "诊所", "药房", "处方", "挂号", "门诊", "住院", "护理", "CDSS",
+    # 金融
+    "银行", "保险", "证券", "基金", "信托", "支付", "清算", "风控",
+    "反洗钱", "征信", "资管", "理财", "贷款", "信用卡",
+    # 教育
+    "学校", "教育", "培训", "课程", "教学", "学生", "考试", "招生",
+    "在线教育", "网课", "双减", "新课标",
+    # 制造
+    "工厂", "制造", "生产", "车间", "MES", "ERP", "PLM", "SCM", "WMS",
+    "工业互联网", "智能制造", "数字孪生", "质检", "设备", "产线",
+    # 零售电商
+    "零售", "电商", "门店", "商城", "订单", "库存", "物流", "配送",
+    "会员", "营销", "促销", "CRM", "POS",
+    # 政务
+    "政府", "政务", "审批", "办事", "公共服务", "智慧城市", "数字政府",
+    # 能源
+    "电力", "能源", "电网", "新能源", "光伏", "风电", "储能", "充电桩",
+    # 交通物流
+    "交通", "物流", "运输", "仓储", "TMS", "调度", "车队"
+)
 
-    # 垂直行业关键词（新增）
-    industry_keywords = [
-        # 医疗健康
-        "医院", "医疗", "HIS", "LIS", "PACS", "EMR", "电子病历", "DRG", "医保",
-        "诊所", "药房", "处方", "挂号", "门诊", "住院", "护理", "CDSS",
-        # 金融
-        "银行", "保险", "证券", "基金", "信托", "支付", "清算", "风控",
-        "反洗钱", "征信", "资管", "理财", "贷款", "信用卡",
-        # 教育
-        "学校", "教育", "培训", "课程", "教学", "学生", "考试", "招生",
-        "在线教育", "网课", "双减", "新课标",
-        # 制造
-        "工厂", "制造", "生产", "车间", "MES", "ERP", "PLM", "SCM", "WMS",
-        "工业互联网", "智能制造", "数字孪生", "质检", "设备", "产线",
-        # 零售电商
-        "零售", "电商", "门店", "商城", "订单", "库存", "物流", "配送",
-        "会员", "营销", "促销", "CRM", "POS",
-        # 政务
-        "政府", "政务", "审批", "办事", "公共服务", "智慧城市", "数字政府",
-        # 能源
-        "电力", "能源", "电网", "新能源", "光伏", "风电", "储能", "充电桩",
-        # 交通物流
-        "交通", "物流", "运输", "仓储", "TMS", "调度", "车队"
-    ]
+# 合规政策关键词（新增）
+SEARCH_RULE_COMPLIANCE_KEYWORDS = (
+    "合规", "标准", "规范", "认证", "等保", "ISO", "GDPR", "隐私",
+    "安全", "审计", "法规", "政策", "监管", "资质", "许可证"
+)
 
-    # 合规政策关键词（新增）
-    compliance_keywords = [
-        "合规", "标准", "规范", "认证", "等保", "ISO", "GDPR", "隐私",
-        "安全", "审计", "法规", "政策", "监管", "资质", "许可证"
-    ]
+# 时效性关键词
+SEARCH_RULE_TIME_SENSITIVE_KEYWORDS = (
+    "最新", "当前", "现在", "近期", "今年", "明年",
+    "2024", "2025", "2026", "2027",
+    "趋势", "未来", "发展", "动态", "变化", "更新",
+    "市场", "行情", "竞品", "对手", "现状"
+)
 
-    # 时效性关键词
-    time_sensitive_keywords = [
-        "最新", "当前", "现在", "近期", "今年", "明年",
-        "2024", "2025", "2026", "2027",
-        "趋势", "未来", "发展", "动态", "变化", "更新",
-        "市场", "行情", "竞品", "对手", "现状"
-    ]
+# 不确定性/专业性关键词（新增）
+SEARCH_RULE_UNCERTAINTY_KEYWORDS = (
+    "怎么选", "如何选择", "哪个好", "推荐", "建议", "比较",
+    "最佳实践", "业界", "头部", "领先", "主流", "标杆"
+)
 
-    # 不确定性/专业性关键词（新增）
-    uncertainty_keywords = [
-        "怎么选", "如何选择", "哪个好", "推荐", "建议", "比较",
-        "最佳实践", "业界", "头部", "领先", "主流", "标杆"
-    ]
+# 关键词在模块加载时统一转小写，规则预判时只需对主题做一次 lower()
+SEARCH_RULE_KEYWORDS = tuple(
+    keyword.lower()
+    for keyword in (
+        SEARCH_RULE_TECH_KEYWORDS
+        + SEARCH_RULE_INDUSTRY_KEYWORDS
+        + SEARCH_RULE_COMPLIANCE_KEYWORDS
+        + SEARCH_RULE_TIME_SENSITIVE_KEYWORDS
+        + SEARCH_RULE_UNCERTAINTY_KEYWORDS
+    )
+)
 
-    all_keywords = (tech_keywords + industry_keywords + compliance_keywords +
-                   time_sensitive_keywords + uncertainty_keywords)
+
+def should_search(topic: str, dimension: str, context: dict) -> bool:
+    """
+    规则预判：快速判断是否可能需要联网搜索（兜底规则）
+    返回 True 表示"可能需要"，后续会交给 AI 做最终判断
+    """
+    if not ENABLE_WEB_SEARCH:
+        return False
 
     # 如果主题包含任何关键词，标记为"可能需要搜索"
-    for keyword in all_keywords:
-        if keyword.lower() in topic.lower():
-            return True
+    normalized_topic = str(topic or "").lower()
+    if any(keyword in normalized_topic for keyword in SEARCH_RULE_KEYWORDS):
+        return True
 
     # 技术约束维度通常需要搜索
     if dimension == "tech_constraints":
@@ -18054,6 +18104,15 @@ def build_default_dimension_entries() -> list[dict]:
     return entries
 
 
+def _get_session_scenario_dimensions(session: dict) -> list[dict]:
+    """读取会话 scenario_config 中的规范化维度；未配置维度时直接返回空列表。"""
+    scenario_config = session.get("scenario_config")
+    raw_dimensions = scenario_config.get("dimensions") if isinstance(scenario_config, dict) else None
+    if not raw_dimensions:
+        return []
+    return normalize_scenario_dimensions(raw_dimensions)
+
+
 def get_dimension_info_for_session(session: dict) -> dict:
     """
     获取会话的维度信息（支持动态场景）
@@ -18067,12 +18126,7 @@ def get_dimension_info_for_session(session: dict) -> dict:
     Returns:
         维度信息字典 {dim_id: {name, description, key_aspects}}
     """
-    scenario_config = session.get("scenario_config")
-    if isinstance(scenario_config, dict):
-        scenario_dimensions = normalize_scenario_dimensions(scenario_config.get("dimensions", []))
-    else:
-        scenario_dimensions = []
-
+    scenario_dimensions = _get_session_scenario_dimensions(session)
     if scenario_dimensions:
         return {
             dim["id"]: {
@@ -18099,12 +18153,7 @@ def get_dimension_order_for_session(session: dict) -> list:
     Returns:
         维度 ID 列表
     """
-    scenario_config = session.get("scenario_config")
-    if isinstance(scenario_config, dict):
-        scenario_dimensions = normalize_scenario_dimensions(scenario_config.get("dimensions", []))
-    else:
-        scenario_dimensions = []
-
+    scenario_dimensions = _get_session_scenario_dimensions(session)
     if scenario_dimensions:
         return [dim["id"] for dim in scenario_dimensions]
 
@@ -18120,7 +18169,6 @@ def get_dimension_order_for_session(session: dict) -> list:
 
 def get_document_hash(content: str) -> str:
     """计算文档内容的hash值，用于摘要缓存"""
-    import hashlib
     return hashlib.md5(content.encode('utf-8')).hexdigest()[:16]
 
 
@@ -18207,6 +18255,40 @@ def save_summary_cache(doc_hash: str, summary: str) -> None:
             print(f"⚠️  保存摘要缓存失败: {e}")
 
 
+def _request_summary_text(summary_client, request_kwargs: dict) -> tuple[str, Optional[float]]:
+    """请求摘要文本；网关支持时走流式输出，返回 (文本, 首 token 耗时秒数)。"""
+    stream_factory = getattr(getattr(summary_client, "messages", None), "stream", None)
+    if not SMART_SUMMARY_STREAM_ENABLED or not callable(stream_factory):
+        response = summary_client.messages.create(**request_kwargs)
+        return extract_message_text(response), None
+
+    started_at = _time.perf_counter()
+    first_token_seconds = None
+    text_parts = []
+    try:
+        with stream_factory(**request_kwargs) as stream:
+            for delta in stream.text_stream:
+                if not delta:
+                    continue
+                if first_token_seconds is None:
+                    first_token_seconds = _time.perf_counter() - started_at
+                text_parts.append(delta)
+    except Exception as exc:
+        # 仅在首个增量到达前失败（网关不支持 SSE 等）时回退一次普通调用；
+        # 已输出部分内容、超时或限流时直接抛出，交由上层按原逻辑截断兜底，避免重复等待与重复消耗
+        if (
+            first_token_seconds is not None
+            or _is_upstream_timeout_error(exc)
+            or _is_upstream_rate_limit_error(exc)
+        ):
+            raise
+        if ENABLE_DEBUG_LOG:
+            print(f"⚠️ 摘要流式输出失败，回退普通调用: {exc}")
+        response = summary_client.messages.create(**request_kwargs)
+        return extract_message_text(response), None
+    return _strip_reasoning_tags("".join(text_parts)), first_token_seconds
+
+
 def summarize_document(content: str, doc_name: str = "文档", topic: str = "") -> tuple[str, bool]:
     """
     智能文档摘要生成（第三阶段优化核心功能）
@@ -18266,22 +18348,35 @@ def summarize_document(content: str, doc_name: str = "文档", topic: str = "")
 直接输出摘要内容，不要添加"摘要："等前缀。"""
 
     try:
-        import time
-        start_time = time.time()
+        start_time = _time.time()
 
+        summary_model = resolve_model_name(call_type="summary")
         with ai_call_priority_slot("doc_summary"):
-            response = summary_client.messages.create(
-                model=resolve_model_name(call_type="summary"),
-                max_tokens=MAX_TOKENS_SUMMARY,
-                timeout=60.0,  # 摘要生成用较短超时
-                messages=[{"role": "user", "content": summary_prompt}]
-            )
+            summary, first_token_seconds = _request_summary_text(summary_client, {
+                "model": summary_model,
+                "max_tokens": MAX_TOKENS_SUMMARY,
+                "timeout": 60.0,  # 摘要生成用较短超时
+                "messages": [{"role": "user", "content": summary_prompt}],
+            })
 
-        response_time = time.time() - start_time
-        summary = extract_message_text(response)
+        response_time = _time.time() - start_time
         if not summary:
             raise ValueError("模型响应中未包含摘要文本")
 
+        if first_token_seconds is not None:
+            # 流式模式下单独记录首 token 延迟，便于和整体耗时对比
+            metrics_collector.record_api_call(
+                call_type="doc_summary_first_token",
+                prompt_length=len(summary_prompt),
+                response_time=first_token_seconds,
+                success=True,
+                max_tokens=MAX_TOKENS_SUMMARY,
+                lane="summary",
+                model=summary_model,
+                stage="doc_summary_first_token",
+                event_kind="pipeline_stage",
+            )
+
         # 记录metrics
         metrics_collector.record_api_call(
             call_type="doc_summary",
@@ -18826,6 +18921,57 @@ HARD_FOLLOW_UP_SIGNALS = {
     "contradiction_detected",
 }
 
+# 回答弱信号的追问权重（信号越多越需要追问，未列出的信号按 0.1 计）
+FOLLOW_UP_SIGNAL_WEIGHTS = {
+    "too_short": 0.4,
+    "vague_expression": 0.5,
+    "generic_answer": 0.8,
+    "option_only": 0.3,
+    "no_quantification": 0.2,
+    "single_selection": 0.2,
+    "contradiction_detected": 0.6,
+}
+
+# 回答充分度信号的抵扣权重；高证据意图下富选项回答抵扣更多
+SUFFICIENT_SIGNAL_WEIGHTS = {
+    "detailed_answer": 0.5,
+    "multi_point_answer": 0.3,
+    "quantified_answer": 0.2,
+    "rich_option_answer": 0.18,
+}
+SUFFICIENT_SIGNAL_WEIGHTS_HIGH_EVIDENCE = {**SUFFICIENT_SIGNAL_WEIGHTS, "rich_option_answer": 0.25}
+
+# 回答质量分的弱信号扣分（未列出的信号按 0.05 计）
+ANSWER_QUALITY_SIGNAL_PENALTIES = {
+    "too_short": 0.2,
+    "vague_expression": 0.25,
+    "generic_answer": 0.3,
+    "option_only": 0.2,
+    "no_quantification": 0.1,
+    "single_selection": 0.1,
+    "contradiction_detected": 0.25,
+}
+ANSWER_QUALITY_SCENARIO_KEYWORDS = ("比如", "例如", "当", "如果", "场景", "案例")
+
+# 追问原因文案（按信号检测顺序取第一个命中的）
+FOLLOW_UP_REASON_MESSAGES = {
+    "too_short": "回答过于简短，需要补充具体细节",
+    "vague_expression": "回答包含模糊表述，需要明确具体要求",
+    "generic_answer": "回答过于笼统，需要深入了解具体需求",
+    "option_only": "当前答案方向明确，但仍需补一个关键依据以支撑后续结论",
+    "no_quantification": "缺少量化指标，需要明确具体数据要求",
+    "single_selection": "只选择了单一选项，需要了解是否还有其他需求",
+    "contradiction_detected": "回答中存在前后冲突，需要澄清真实约束",
+}
+FOLLOW_UP_REASON_FALLBACK = "需要进一步了解详细需求"
+
+# 追问预算耗尽原因文案
+FOLLOW_UP_BUDGET_EXHAUSTED_REASONS = {
+    "total_budget_exhausted": "会话追问预算已用完",
+    "dimension_budget_exhausted": "当前维度追问预算已用完",
+    "question_budget_exhausted": "当前问题追问次数已达上限",
+}
+
 # 疲劳度信号权重
 FATIGUE_SIGNALS = {
     "consecutive_short": {
@@ -18850,6 +18996,41 @@ FATIGUE_SIGNALS = {
     }
 }
 
+# 疲劳信号按检测顺序展开为 (信号, 阈值, 权重)，计算疲劳度时不再逐层查字典
+FATIGUE_SIGNAL_RULES = tuple(
+    (signal, FATIGUE_SIGNALS[signal]["threshold"], FATIGUE_SIGNALS[signal]["weight"])
+    for signal in ("consecutive_short", "option_only_streak", "same_dimension_too_long", "total_questions_high")
+)
+
+# 关键方面相关词（饱和度覆盖判断用，未出现关键方面原文时按相关词兜底）
+ASPECT_COVERAGE_KEYWORDS = {
+    "核心痛点": ("痛点", "问题", "困难", "挑战", "困扰"),
+    "期望价值": ("价值", "收益", "效果", "目标", "期望"),
+    "使用场景": ("场景", "情况", "使用", "应用", "何时"),
+    "用户角色": ("用户", "角色", "人员", "谁", "使用者"),
+    "关键流程": ("流程", "步骤", "环节", "过程"),
+    "角色分工": ("分工", "职责", "负责", "部门"),
+    "触发事件": ("触发", "开始", "启动", "何时"),
+    "异常处理": ("异常", "错误", "失败", "例外"),
+    "部署方式": ("部署", "云", "本地", "服务器"),
+    "系统集成": ("集成", "对接", "接口", "系统"),
+    "性能要求": ("性能", "响应", "并发", "速度"),
+    "安全合规": ("安全", "合规", "权限", "加密"),
+    "预算范围": ("预算", "费用", "成本", "价格"),
+    "时间节点": ("时间", "期限", "周期", "何时"),
+    "资源限制": ("资源", "人力", "团队", "限制"),
+    "优先级": ("优先", "重要", "紧急", "先后"),
+}
+
+# 饱和度深度信号关键词（具体场景 / 对比取舍 / 原因说明）
+# 每组仅 4~6 个词，any + in 已走 C 层子串查找；实测在数百字以上的回答上正则交替并不更快，故保持元组
+DEPTH_SCENARIO_KEYWORDS = ("比如", "例如", "当", "如果", "场景", "情况下")
+DEPTH_COMPARISON_KEYWORDS = ("而不是", "优先", "相比", "更重要", "首先")
+DEPTH_REASON_KEYWORDS = ("因为", "由于", "所以", "原因是")
+
+# 回答中是否出现数字（量化信号），用正则在 C 层扫描，避免逐字符调用 isdigit
+ANSWER_DIGIT_PATTERN = re.compile(r"\d")
+
 # 信息饱和度阈值
 SATURATION_THRESHOLDS = {
     "high": 0.8,       # 高饱和度，停止追问
@@ -18867,7 +19048,7 @@ def get_mode_identifier(session: dict) -> str:
 
 def get_mode_saturation_thresholds(session: dict) -> dict:
     """获取当前模式的饱和度阈值。"""
-    mode_config = get_interview_mode_config(session)
+    mode_config = _get_shared_interview_mode_config(session)
     quality = mode_config.get("quality_thresholds") or {}
     return {
         "high": quality.get("high", SATURATION_THRESHOLDS["high"]),
@@ -18876,32 +19057,136 @@ def get_mode_saturation_thresholds(session: dict) -> dict:
     }
 
 
+# 各模式的基础配置与 V2 覆盖在导入时合并一次，避免每次读取都重新构造字典
+INTERVIEW_MODE_MERGED_CONFIGS = {
+    mode: {
+        **INTERVIEW_MODES.get(mode, INTERVIEW_MODES[DEFAULT_INTERVIEW_MODE]),
+        **INTERVIEW_MODES_V2.get(mode, {}),
+    }
+    for mode in (*INTERVIEW_MODES, *INTERVIEW_MODES_V2)
+}
+
+
+def _get_shared_interview_mode_config(session: dict) -> dict:
+    """获取会话模式的共享合并配置（仅供内部高频只读调用，禁止修改返回值）。"""
+    return INTERVIEW_MODE_MERGED_CONFIGS[get_mode_identifier(session)]
+
+
 def get_interview_mode_config(session: dict) -> dict:
-    """获取会话的访谈模式配置"""
-    mode = get_mode_identifier(session)
-    base_config = dict(INTERVIEW_MODES.get(mode, INTERVIEW_MODES[DEFAULT_INTERVIEW_MODE]))
-    v2_override = INTERVIEW_MODES_V2.get(mode, {})
-    return {**base_config, **v2_override}
+    """获取会话的访谈模式配置（返回副本，调用方修改不影响共享配置）。"""
+    return dict(_get_shared_interview_mode_config(session))
 
 
 def get_interview_mode_display_config(mode: str) -> dict:
     """获取某个模式的展示配置（用于前端UI渲染）。"""
-    base = dict(INTERVIEW_MODES.get(mode, INTERVIEW_MODES[DEFAULT_INTERVIEW_MODE]))
-    v2_override = INTERVIEW_MODES_V2.get(mode, {})
-    return {**base, **v2_override}
+    merged = INTERVIEW_MODE_MERGED_CONFIGS.get(mode)
+    if merged is None:
+        return dict(INTERVIEW_MODES[DEFAULT_INTERVIEW_MODE])
+    return dict(merged)
+
+
+# ============ 访谈指标请求级缓存 ============
+# 同一请求内会多次评估同一维度（下一题、完成门禁、综合追问决策），
+# 饱和度/疲劳度/追问预算都是会话状态的纯函数，作用域内按会话状态复用计算结果。
+interview_metric_memo_local = threading.local()
+
+
+@contextmanager
+def interview_metric_memo_scope():
+    """开启访谈指标缓存作用域；嵌套时复用外层缓存，退出最外层时清空。"""
+    if getattr(interview_metric_memo_local, "memo", None) is not None:
+        yield
+        return
+
+    interview_metric_memo_local.memo = {}
+    try:
+        yield
+    finally:
+        interview_metric_memo_local.memo = None
+
+
+def with_interview_metric_memo(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with interview_metric_memo_scope():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _memoize_interview_metric(func):
+    """仅在缓存作用域内生效；键包含会话对象与访谈记录长度，追加回答后自动失效。"""
+    @wraps(func)
+    def wrapper(session: dict, dimension: str, **kwargs):
+        memo = getattr(interview_metric_memo_local, "memo", None)
+        if memo is None or not isinstance(session, dict):
+            return func(session, dimension, **kwargs)
+
+        interview_log = session.get("interview_log")
+        scenario_config = session.get("scenario_config")
+        memo_key = (
+            func.__name__,
+            id(session),
+            id(interview_log),
+            len(interview_log) if isinstance(interview_log, list) else -1,
+            session.get("interview_mode"),
+            id(scenario_config),
+            dimension,
+        )
+        entry = memo.get(memo_key)
+        if entry is None:
+            # 同时持有键中 id 对应的对象，防止其被回收后地址复用导致脏读
+            entry = (session, interview_log, scenario_config, func(session, dimension, **kwargs))
+            memo[memo_key] = entry
+        # 结果只含标量与一层列表，浅拷贝即可隔离调用方的修改
+        return {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in entry[3].items()
+        }
+
+    return wrapper
+
+
+def get_dimension_logs(session: dict, dimension: str) -> list:
+    """
+    按维度筛选访谈记录。
+
+    在指标缓存作用域内按（访谈记录对象, 长度）建立一次维度分组索引，
+    同一请求内各指标再次读取时直接取分组结果，追加或删除记录后索引自动失效。
+    """
+    interview_log = session.get("interview_log", [])
+    memo = getattr(interview_metric_memo_local, "memo", None)
+    if memo is None or not isinstance(interview_log, list):
+        return [log for log in interview_log if log.get("dimension") == dimension]
+
+    memo_key = ("dimension_logs_index", id(interview_log), len(interview_log))
+    entry = memo.get(memo_key)
+    if entry is None:
+        # 持有访谈记录对象，防止其被回收后 id 复用
+        entry = (interview_log, group_interview_logs_by_dimension(interview_log))
+        memo[memo_key] = entry
+    return list(entry[1].get(dimension, ()))
+
+
+def group_interview_logs_by_dimension(interview_log: list) -> dict:
+    """一次遍历把访谈记录按维度分组。"""
+    logs_by_dimension = {}
+    for log in interview_log:
+        logs_by_dimension.setdefault(log.get("dimension"), []).append(log)
+    return logs_by_dimension
 
 
 def calculate_dimension_coverage(session: dict, dimension: str) -> int:
     """计算维度覆盖度（只统计正式问题）"""
-    formal_count = len([log for log in session.get("interview_log", [])
-                       if log.get("dimension") == dimension and not log.get("is_follow_up", False)])
-    mode_config = get_interview_mode_config(session)
+    formal_count = len([log for log in get_dimension_logs(session, dimension) if not log.get("is_follow_up", False)])
+    mode_config = _get_shared_interview_mode_config(session)
     required_questions = mode_config.get("max_formal_questions_per_dim", mode_config.get("formal_questions_per_dim", 3))
     if required_questions <= 0:
         return 100
     return min(100, int(formal_count / required_questions * 100))
 
 
+@_memoize_interview_metric
 def get_follow_up_budget_status(session: dict, dimension: str) -> dict:
     """
     计算追问预算使用情况
@@ -18918,30 +19203,30 @@ def get_follow_up_budget_status(session: dict, dimension: str) -> dict:
             "budget_exhausted_reason": str or None  # 预算耗尽原因
         }
     """
-    mode_config = get_interview_mode_config(session)
+    mode_config = _get_shared_interview_mode_config(session)
     interview_log = session.get("interview_log", [])
 
-    # 计算总追问次数
-    total_follow_ups = len([log for log in interview_log if log.get("is_follow_up", False)])
-    total_budget = mode_config["total_follow_up_budget"]
+    # 单次遍历同时统计：总追问数、当前维度追问数、当前维度最后一个正式问题之后的追问数
+    total_follow_ups = 0
+    dim_follow_ups = 0
+    current_question_follow_ups = 0
+    has_formal_in_dim = False
+    for log in interview_log:
+        is_follow_up = log.get("is_follow_up", False)
+        if is_follow_up:
+            total_follow_ups += 1
+        if log.get("dimension") != dimension:
+            continue
+        if is_follow_up:
+            dim_follow_ups += 1
+            if has_formal_in_dim:
+                current_question_follow_ups += 1
+        else:
+            has_formal_in_dim = True
+            current_question_follow_ups = 0
 
-    # 计算当前维度的追问次数
-    dim_logs = [log for log in interview_log if log.get("dimension") == dimension]
-    dim_follow_ups = len([log for log in dim_logs if log.get("is_follow_up", False)])
+    total_budget = mode_config["total_follow_up_budget"]
     dim_budget = mode_config["follow_up_budget_per_dim"]
-
-    # 计算当前正式问题的追问次数
-    # 找到最后一个正式问题的索引
-    formal_indices = [i for i, log in enumerate(dim_logs) if not log.get("is_follow_up", False)]
-    if formal_indices:
-        last_formal_idx = formal_indices[-1]
-        # 统计这个正式问题之后的追问数
-        current_question_follow_ups = len([
-            log for log in dim_logs[last_formal_idx + 1:]
-            if log.get("is_follow_up", False)
-        ])
-    else:
-        current_question_follow_ups = 0
     current_question_budget = mode_config["max_questions_per_formal"]
 
     # 判断是否能继续追问
@@ -18970,10 +19255,13 @@ def get_follow_up_budget_status(session: dict, dimension: str) -> dict:
     }
 
 
-def calculate_dimension_saturation(session: dict, dimension: str) -> dict:
+@_memoize_interview_metric
+def calculate_dimension_saturation(session: dict, dimension: str, dim_logs: Optional[list] = None) -> dict:
     """
     计算维度的信息饱和度
 
+    dim_logs 为调用方已按维度筛好的访谈记录，传入时不再重复遍历 interview_log
+
     Returns:
         {
             "saturation_score": float,   # 0-1 饱和度分数
@@ -18984,8 +19272,8 @@ def calculate_dimension_saturation(session: dict, dimension: str) -> dict:
             "level": str                 # "high", "medium", "low"
         }
     """
-    interview_log = session.get("interview_log", [])
-    dim_logs = [log for log in interview_log if log.get("dimension") == dimension]
+    if dim_logs is None:
+        dim_logs = get_dimension_logs(session, dimension)
 
     if not dim_logs:
         return {
@@ -19001,59 +19289,38 @@ def calculate_dimension_saturation(session: dict, dimension: str) -> dict:
     dim_info = session_dim_info.get(dimension, {})
     key_aspects = dim_info.get("key_aspects", [])
 
-    # 1. 信息覆盖度：检查关键方面是否被提及
-    all_answers = " ".join([log.get("answer", "") for log in dim_logs])
-    all_questions = " ".join([log.get("question", "") for log in dim_logs])
-    combined_text = all_answers + all_questions
+    # 1. 信息覆盖度：检查关键方面是否被提及（一次遍历同时收集回答与问题）
+    answers = []
+    questions = []
+    for log in dim_logs:
+        answers.append(log.get("answer", ""))
+        questions.append(log.get("question", ""))
+    all_answers = " ".join(answers)
+    combined_text = all_answers + " ".join(questions)
 
     covered_aspects = []
     for aspect in key_aspects:
-        # 检查关键词是否出现在问答中
-        if aspect in combined_text:
+        # 先查关键方面原文，再查相关词；命中任一即视为已覆盖
+        if aspect in combined_text or any(
+            keyword in combined_text for keyword in ASPECT_COVERAGE_KEYWORDS.get(aspect, ())
+        ):
             covered_aspects.append(aspect)
-        else:
-            # 检查相关词
-            aspect_keywords = {
-                "核心痛点": ["痛点", "问题", "困难", "挑战", "困扰"],
-                "期望价值": ["价值", "收益", "效果", "目标", "期望"],
-                "使用场景": ["场景", "情况", "使用", "应用", "何时"],
-                "用户角色": ["用户", "角色", "人员", "谁", "使用者"],
-                "关键流程": ["流程", "步骤", "环节", "过程"],
-                "角色分工": ["分工", "职责", "负责", "部门"],
-                "触发事件": ["触发", "开始", "启动", "何时"],
-                "异常处理": ["异常", "错误", "失败", "例外"],
-                "部署方式": ["部署", "云", "本地", "服务器"],
-                "系统集成": ["集成", "对接", "接口", "系统"],
-                "性能要求": ["性能", "响应", "并发", "速度"],
-                "安全合规": ["安全", "合规", "权限", "加密"],
-                "预算范围": ["预算", "费用", "成本", "价格"],
-                "时间节点": ["时间", "期限", "周期", "何时"],
-                "资源限制": ["资源", "人力", "团队", "限制"],
-                "优先级": ["优先", "重要", "紧急", "先后"]
-            }
-            for keyword in aspect_keywords.get(aspect, []):
-                if keyword in combined_text:
-                    covered_aspects.append(aspect)
-                    break
 
     coverage_score = len(covered_aspects) / len(key_aspects) if key_aspects else 0
 
     # 2. 信息深度：检查是否有量化、具体场景、对比等深度信号
     depth_signals = 0
     # 检查数字（量化信息）
-    if any(c.isdigit() for c in all_answers):
+    if ANSWER_DIGIT_PATTERN.search(all_answers):
         depth_signals += 1
     # 检查具体场景描述（包含"比如"、"例如"、"当...时"等）
-    scenario_keywords = ["比如", "例如", "当", "如果", "场景", "情况下"]
-    if any(kw in all_answers for kw in scenario_keywords):
+    if any(kw in all_answers for kw in DEPTH_SCENARIO_KEYWORDS):
         depth_signals += 1
     # 检查对比或选择（"而不是"、"优先"、"相比"）
-    comparison_keywords = ["而不是", "优先", "相比", "更重要", "首先"]
-    if any(kw in all_answers for kw in comparison_keywords):
+    if any(kw in all_answers for kw in DEPTH_COMPARISON_KEYWORDS):
         depth_signals += 1
     # 检查原因说明（"因为"、"由于"、"所以"）
-    reason_keywords = ["因为", "由于", "所以", "原因是"]
-    if any(kw in all_answers for kw in reason_keywords):
+    if any(kw in all_answers for kw in DEPTH_REASON_KEYWORDS):
         depth_signals += 1
     # 检查多点回答
     if "；" in all_answers or "、" in all_answers:
@@ -19061,8 +19328,8 @@ def calculate_dimension_saturation(session: dict, dimension: str) -> dict:
 
     depth_score = min(1.0, depth_signals / 5)
 
-    # 3. 信息量：基于总字符数
-    total_chars = sum(len(log.get("answer", "")) for log in dim_logs)
+    # 3. 信息量：基于总字符数（拼接结果长度减去分隔空格数，无需再遍历一次记录）
+    total_chars = len(all_answers) - (len(dim_logs) - 1)
     # 期望每个维度至少收集 300 字符的有效信息
     volume_score = min(1.0, total_chars / 300)
 
@@ -19089,10 +19356,13 @@ def calculate_dimension_saturation(session: dict, dimension: str) -> dict:
     }
 
 
-def calculate_user_fatigue(session: dict, dimension: str) -> dict:
+@_memoize_interview_metric
+def calculate_user_fatigue(session: dict, dimension: str, dim_logs: Optional[list] = None) -> dict:
     """
     计算用户疲劳度
 
+    dim_logs 为调用方已按维度筛好的访谈记录，传入时不再重复遍历 interview_log
+
     Returns:
         {
             "fatigue_score": float,      # 0-1 疲劳度分数
@@ -19102,39 +19372,29 @@ def calculate_user_fatigue(session: dict, dimension: str) -> dict:
         }
     """
     interview_log = session.get("interview_log", [])
-    dim_logs = [log for log in interview_log if log.get("dimension") == dimension]
+    if dim_logs is None:
+        dim_logs = get_dimension_logs(session, dimension)
 
     detected_signals = []
     fatigue_score = 0
 
-    # 1. 检查连续简短回答
-    recent_answers = [log.get("answer", "") for log in interview_log[-5:]]
-    short_count = sum(1 for ans in recent_answers if len(ans.strip()) < 30)
-    if short_count >= FATIGUE_SIGNALS["consecutive_short"]["threshold"]:
-        detected_signals.append("consecutive_short")
-        fatigue_score += FATIGUE_SIGNALS["consecutive_short"]["weight"]
-
-    # 2. 检查连续只选选项
-    recent_logs = interview_log[-5:]
+    # 最近 5 条记录只切片一次，一次遍历同时统计简短回答与只选选项
+    short_count = 0
     option_only_count = 0
-    for log in recent_logs:
-        options = log.get("options", [])
+    for log in interview_log[-5:]:
         answer = log.get("answer", "")
+        if len(answer.strip()) < 30:
+            short_count += 1
+        options = log.get("options", [])
         if options and answer in options and len(answer) < 40:
             option_only_count += 1
-    if option_only_count >= FATIGUE_SIGNALS["option_only_streak"]["threshold"]:
-        detected_signals.append("option_only_streak")
-        fatigue_score += FATIGUE_SIGNALS["option_only_streak"]["weight"]
 
-    # 3. 检查同一维度问题过多
-    if len(dim_logs) >= FATIGUE_SIGNALS["same_dimension_too_long"]["threshold"]:
-        detected_signals.append("same_dimension_too_long")
-        fatigue_score += FATIGUE_SIGNALS["same_dimension_too_long"]["weight"]
-
-    # 4. 检查总问题数
-    if len(interview_log) >= FATIGUE_SIGNALS["total_questions_high"]["threshold"]:
-        detected_signals.append("total_questions_high")
-        fatigue_score += FATIGUE_SIGNALS["total_questions_high"]["weight"]
+    # 依次检查：连续简短回答、连续只选选项、同一维度问题过多、总问题数
+    signal_values = (short_count, option_only_count, len(dim_logs), len(interview_log))
+    for (signal, threshold, weight), value in zip(FATIGUE_SIGNAL_RULES, signal_values):
+        if value >= threshold:
+            detected_signals.append(signal)
+            fatigue_score += weight
 
     fatigue_score = min(1.0, fatigue_score)
 
@@ -19154,9 +19414,28 @@ def calculate_user_fatigue(session: dict, dimension: str) -> dict:
     }
 
 
-def get_dimension_missing_aspects(session: dict, dimension: str) -> list:
-    """获取当前维度尚未覆盖的关键方面。"""
-    saturation = calculate_dimension_saturation(session, dimension)
+def calculate_all_dimension_saturations(session: dict, dimensions=None,
+                                        logs_by_dimension: Optional[dict] = None) -> dict:
+    """
+    批量计算各维度饱和度，返回 {维度: 饱和度结果}。
+
+    访谈记录只分组一次，避免逐维度调用时每次都遍历整份 interview_log。
+    dimensions 缺省为会话的维度顺序。
+    """
+    if logs_by_dimension is None:
+        logs_by_dimension = group_interview_logs_by_dimension(session.get("interview_log", []))
+    if dimensions is None:
+        dimensions = get_dimension_order_for_session(session) or list(get_dimension_info_for_session(session).keys())
+    return {
+        dim_key: calculate_dimension_saturation(session, dim_key, dim_logs=logs_by_dimension.get(dim_key, []))
+        for dim_key in dimensions
+    }
+
+
+def get_dimension_missing_aspects(session: dict, dimension: str, saturation: Optional[dict] = None) -> list:
+    """获取当前维度尚未覆盖的关键方面；已算过饱和度时可直接传入复用。"""
+    if saturation is None:
+        saturation = calculate_dimension_saturation(session, dimension)
     covered = set(saturation.get("covered_aspects", []))
     dim_info = get_dimension_info_for_session(session).get(dimension, {})
     key_aspects = dim_info.get("key_aspects", [])
@@ -19179,9 +19458,10 @@ def get_follow_up_round_for_dimension_logs(dim_logs: list) -> int:
     return chained
 
 
-def has_pending_forced_follow_up(session: dict, dimension: str) -> bool:
+def has_pending_forced_follow_up(session: dict, dimension: str, dim_logs: Optional[list] = None) -> bool:
     """判断当前维度是否存在待执行的强制追问。"""
-    dim_logs = [log for log in session.get("interview_log", []) if log.get("dimension") == dimension]
+    if dim_logs is None:
+        dim_logs = get_dimension_logs(session, dimension)
     if not dim_logs:
         return False
 
@@ -19495,14 +19775,23 @@ def build_session_evidence_ledger(session: dict) -> dict:
     total_follow_up = 0
     total_weighted_evidence = 0.0
     total_pending_follow_up = 0
+    logs_by_dimension = group_interview_logs_by_dimension(interview_log)
+    saturations = calculate_all_dimension_saturations(
+        normalized_session,
+        dimension_order,
+        logs_by_dimension=logs_by_dimension,
+    )
 
     for dim_key in dimension_order:
-        dim_logs = [log for log in interview_log if log.get("dimension") == dim_key]
+        dim_logs = logs_by_dimension.get(dim_key, [])
         formal_logs = [log for log in dim_logs if not log.get("is_follow_up", False)]
         follow_up_logs = [log for log in dim_logs if log.get("is_follow_up", False)]
         info = dim_info_map.get(dim_key, {})
         key_aspects = info.get("key_aspects", []) if isinstance(info.get("key_aspects", []), list) else []
-        missing_aspects = get_dimension_missing_aspects(normalized_session, dim_key) if (dim_logs or key_aspects) else []
+        missing_aspects = (
+            get_dimension_missing_aspects(normalized_session, dim_key, saturation=saturations[dim_key])
+            if (dim_logs or key_aspects) else []
+        )
 
         evidence_counts = {"explicit": 0, "rich_option": 0, "weak_inferred": 0, "pending_follow_up": 0}
         quality_scores = []
@@ -19922,7 +20211,7 @@ def _score_rich_option_answer(question: str, answer: str, options: list = None,
         score += 1
     if any(token in primary_option for token in RICH_OPTION_PROCESS_KEYWORDS):
         score += 1
-    if any(char.isdigit() for char in primary_option):
+    if ANSWER_DIGIT_PATTERN.search(primary_option):
         score += 1
     if any(token in normalized_question for token in ("原因", "场景", "影响", "频次", "角色", "流程", "瓶颈")):
         score += 1
@@ -19957,22 +20246,12 @@ def evaluate_answer_quality(eval_result: dict, answer: str, is_follow_up: bool,
     if eval_result.get("has_numbers"):
         quality_score += 0.1
 
-    scenario_keywords = ["比如", "例如", "当", "如果", "场景", "案例"]
-    if any(keyword in (answer or "") for keyword in scenario_keywords):
+    if any(keyword in (answer or "") for keyword in ANSWER_QUALITY_SCENARIO_KEYWORDS):
         quality_score += 0.1
     if "rich_option_answer" in signals:
         quality_score += 0.12
 
-    negative_penalty = {
-        "too_short": 0.2,
-        "vague_expression": 0.25,
-        "generic_answer": 0.3,
-        "option_only": 0.2,
-        "no_quantification": 0.1,
-        "single_selection": 0.1,
-        "contradiction_detected": 0.25,
-    }
-    quality_score -= sum(negative_penalty.get(signal, 0.05) for signal in signals)
+    quality_score -= sum(ANSWER_QUALITY_SIGNAL_PENALTIES.get(signal, 0.05) for signal in signals)
 
     if is_follow_up and follow_up_round >= 1 and not hard_triggered:
         quality_score += 0.05
@@ -20326,26 +20605,50 @@ def should_reject_visible_question(
     return {"reject": False, "reason": "", "quality_gate": quality_gate}
 
 
+@with_interview_metric_memo
 def evaluate_dimension_completion_v2(session: dict, dimension: str) -> dict:
     """维度完成门禁（V2）：题量 + 质量 + 强制追问。"""
-    mode_config = get_interview_mode_config(session)
-    dim_logs = [log for log in session.get("interview_log", []) if log.get("dimension") == dimension]
+    mode_config = _get_shared_interview_mode_config(session)
+    # 维度记录只筛一次，饱和度、疲劳度、强制追问判断共用
+    dim_logs = get_dimension_logs(session, dimension)
     formal_count = len([log for log in dim_logs if not log.get("is_follow_up", False)])
     min_formal = mode_config.get("formal_questions_per_dim", 3)
     max_formal = mode_config.get("max_formal_questions_per_dim", min_formal)
 
+    follow_up_round = get_follow_up_round_for_dimension_logs(dim_logs)
+    pending_forced_follow_up = has_pending_forced_follow_up(session, dimension, dim_logs=dim_logs)
+
+    # 1. 待执行强制追问 / 2. 最低正式题未达标：只依赖题量与追问状态，未通过时直接返回，跳过饱和度等文本指标计算
+    early_continue_reason = ""
+    if pending_forced_follow_up and follow_up_round < 1:
+        early_continue_reason = "存在待执行的关键追问，需要至少追问1次"
+    elif formal_count < min_formal:
+        early_continue_reason = f"正式问题数量不足（{formal_count}/{min_formal}）"
+    if early_continue_reason:
+        return {
+            "can_complete": False,
+            "reason": early_continue_reason,
+            "action": "continue",
+            "quality_warning": False,
+            "snapshot": {
+                "formal_count": formal_count,
+                "min_formal": min_formal,
+                "max_formal": max_formal,
+                "follow_up_round": follow_up_round,
+                "pending_forced_follow_up": pending_forced_follow_up,
+            },
+        }
+
     budget_status = get_follow_up_budget_status(session, dimension)
-    saturation = calculate_dimension_saturation(session, dimension)
-    fatigue = calculate_user_fatigue(session, dimension)
+    saturation = calculate_dimension_saturation(session, dimension, dim_logs=dim_logs)
+    fatigue = calculate_user_fatigue(session, dimension, dim_logs=dim_logs)
 
     quality_thresholds = mode_config.get("quality_thresholds") or {}
     coverage_threshold = quality_thresholds.get("coverage", 0.8)
     depth_threshold = quality_thresholds.get("depth", 0.6)
     volume_threshold = quality_thresholds.get("volume", 0.45)
 
-    missing_aspects = get_dimension_missing_aspects(session, dimension)
-    follow_up_round = get_follow_up_round_for_dimension_logs(dim_logs)
-    pending_forced_follow_up = has_pending_forced_follow_up(session, dimension)
+    missing_aspects = get_dimension_missing_aspects(session, dimension, saturation=saturation)
 
     snapshot = {
         "formal_count": formal_count,
@@ -20362,26 +20665,6 @@ def evaluate_dimension_completion_v2(session: dict, dimension: str) -> dict:
         "fatigue": fatigue,
     }
 
-    # 1. 待执行强制追问
-    if pending_forced_follow_up and follow_up_round < 1:
-        return {
-            "can_complete": False,
-            "reason": "存在待执行的关键追问，需要至少追问1次",
-            "action": "continue",
-            "quality_warning": False,
-            "snapshot": snapshot,
-        }
-
-    # 2. 最低正式题未达标
-    if formal_count < min_formal:
-        return {
-            "can_complete": False,
-            "reason": f"正式问题数量不足（{formal_count}/{min_formal}）",
-            "action": "continue",
-            "quality_warning": False,
-            "snapshot": snapshot,
-        }
-
     meets_quality = (
         saturation.get("coverage_score", 0) >= coverage_threshold
         and saturation.get("depth_score", 0) >= depth_threshold
@@ -20445,14 +20728,9 @@ def should_follow_up_comprehensive(session: dict, dimension: str,
     # 1. 检查预算
     budget_status = get_follow_up_budget_status(session, dimension)
     if not budget_status["can_follow_up"]:
-        reason_map = {
-            "total_budget_exhausted": "会话追问预算已用完",
-            "dimension_budget_exhausted": "当前维度追问预算已用完",
-            "question_budget_exhausted": "当前问题追问次数已达上限"
-        }
         return {
             "should_follow_up": False,
-            "reason": reason_map.get(budget_status["budget_exhausted_reason"], "预算已用完"),
+            "reason": FOLLOW_UP_BUDGET_EXHAUSTED_REASONS.get(budget_status["budget_exhausted_reason"], "预算已用完"),
             "budget_status": budget_status,
             "saturation": {},
             "fatigue": {},
@@ -20460,13 +20738,15 @@ def should_follow_up_comprehensive(session: dict, dimension: str,
         }
 
     fatigue = calculate_user_fatigue(session, dimension)
+    # 预算之后的各分支都需要饱和度，只计算一次
+    saturation = calculate_dimension_saturation(session, dimension)
 
     if normalized_preflight.get("force_follow_up") and fatigue.get("fatigue_score", 0) < 0.9:
         return {
             "should_follow_up": True,
             "reason": normalized_preflight.get("reason") or "证据预检发现关键缺口，需要优先补齐",
             "budget_status": budget_status,
-            "saturation": calculate_dimension_saturation(session, dimension),
+            "saturation": saturation,
             "fatigue": fatigue,
             "decision_factors": ["mid_interview_preflight"]
         }
@@ -20478,13 +20758,12 @@ def should_follow_up_comprehensive(session: dict, dimension: str,
             "should_follow_up": True,
             "reason": rule_based_result.get("reason") or "检测到关键模糊/冲突，需要至少追问一次",
             "budget_status": budget_status,
-            "saturation": calculate_dimension_saturation(session, dimension),
+            "saturation": saturation,
             "fatigue": fatigue,
             "decision_factors": ["hard_signal_forced_follow_up"]
         }
 
     # 2. 检查饱和度
-    saturation = calculate_dimension_saturation(session, dimension)
     if saturation["level"] == "high":
         decision_factors.append("high_saturation")
         return {
@@ -20570,6 +20849,10 @@ def should_follow_up_comprehensive(session: dict, dimension: str,
     }
 
 
+# 从模型评分文本中提取首个数字（整数或小数）
+ASSESSMENT_SCORE_PATTERN = re.compile(r"(\d+\.?\d*)")
+
+
 def score_assessment_answer(session: dict, dimension: str, question: str, answer: str) -> Optional[float]:
     """
     为评估场景的回答打分（1-5分）
@@ -20640,8 +20923,7 @@ def score_assessment_answer(session: dict, dimension: str, question: str, answer
         if not raw:
             raise ValueError("模型响应中未包含评分文本")
         # 提取数字
-        import re
-        match = re.search(r'(\d+\.?\d*)', raw)
+        match = ASSESSMENT_SCORE_PATTERN.search(raw)
         if match:
             score = float(match.group(1))
             return max(1.0, min(5.0, score))  # 限制在 1-5 范围
@@ -20652,6 +20934,34 @@ def score_assessment_answer(session: dict, dimension: str, question: str, answer
     return None
 
 
+# 回答深度评估词库
+ANSWER_VAGUE_INDICATORS = (
+    # 不确定类
+    "看情况", "不一定", "可能", "或许", "大概", "差不多", "到时候",
+    "再说", "还没想好", "不确定", "看具体", "根据情况", "待定",
+    "以后再说", "暂时不清楚", "目前还不好说",
+    # 笼统类
+    "都可以", "都行", "随便", "无所谓", "一般",
+    # 回避类
+    "不太了解", "没想过", "不知道", "说不好", "很难说",
+)
+# 模糊词较多，合并为一条正则只扫描一遍回答
+ANSWER_VAGUE_PATTERN = re.compile("|".join(re.escape(keyword) for keyword in ANSWER_VAGUE_INDICATORS))
+ANSWER_GENERIC_REPLIES = frozenset({
+    "好的", "是的", "可以", "没问题", "需要", "应该要",
+    "对", "嗯", "行", "同意", "没有", "不需要",
+})
+ANSWER_QUANTITATIVE_DIMENSIONS = frozenset({"tech_constraints", "project_constraints"})
+ANSWER_CONTRADICTION_PAIRS = (
+    ("需要", "不需要"),
+    ("可以", "不可以"),
+    ("支持", "不支持"),
+    ("已经", "还没"),
+    ("有", "没有"),
+    ("必须", "可选"),
+)
+
+
 def evaluate_answer_depth(question: str, answer: str, dimension: str,
                           options: list = None, is_follow_up: bool = False,
                           multi_select: bool = False,
@@ -20704,26 +21014,11 @@ def evaluate_answer_depth(question: str, answer: str, dimension: str,
         signals.append("too_short")
 
     # 2. 模糊表达检测（扩展词库）
-    vague_indicators = [
-        # 不确定类
-        "看情况", "不一定", "可能", "或许", "大概", "差不多", "到时候",
-        "再说", "还没想好", "不确定", "看具体", "根据情况", "待定",
-        "以后再说", "暂时不清楚", "目前还不好说",
-        # 笼统类
-        "都可以", "都行", "随便", "无所谓", "差不多", "一般",
-        # 回避类
-        "不太了解", "没想过", "不知道", "说不好", "很难说",
-    ]
-    matched_vague = [v for v in vague_indicators if v in answer_stripped]
-    if matched_vague:
+    if ANSWER_VAGUE_PATTERN.search(answer_stripped):
         signals.append("vague_expression")
 
     # 3. 完全匹配泛泛回答
-    generic_answers = [
-        "好的", "是的", "可以", "没问题", "需要", "应该要",
-        "对", "嗯", "行", "同意", "没有", "不需要",
-    ]
-    if answer_stripped in generic_answers:
+    if answer_stripped in ANSWER_GENERIC_REPLIES:
         signals.append("generic_answer")
 
     # 4. 仅选择了预设选项没有补充（答案等于某个选项原文）
@@ -20741,30 +21036,23 @@ def evaluate_answer_depth(question: str, answer: str, dimension: str,
             signals.append("rich_option_answer")
 
     # 5. 缺乏量化信息（对某些维度重要）
-    has_numbers = any(c.isdigit() for c in answer_stripped)
-    quantitative_dimensions = ["tech_constraints", "project_constraints"]
-    if dimension in quantitative_dimensions and not has_numbers and answer_len < 60:
+    has_numbers = ANSWER_DIGIT_PATTERN.search(answer_stripped) is not None
+    if dimension in ANSWER_QUANTITATIVE_DIMENSIONS and not has_numbers and answer_len < 60:
         signals.append("no_quantification")
 
     # 6. 多选但只选了一个（可能需要补充）
-    if multi_select and options and "；" not in answer_stripped and len(options) >= 3 and not is_rich_option_answer:
-        # 检查是否是多选题但只选了一个
-        selected_count = sum(1 for opt in options if opt in answer_stripped)
-        if selected_count <= 1 and answer_len < 30:
+    if (multi_select and options and answer_len < 30 and "；" not in answer_stripped
+            and len(options) >= 3 and not is_rich_option_answer):
+        # 检查是否是多选题但只选了一个：命中第二个选项即可判定，不必扫完全部选项
+        selected_options = (opt for opt in options if opt in answer_stripped)
+        next(selected_options, None)
+        if next(selected_options, None) is None:
             signals.append("single_selection")
 
     # 7. 轻量矛盾检测
-    contradiction_pairs = [
-        ("需要", "不需要"),
-        ("可以", "不可以"),
-        ("支持", "不支持"),
-        ("已经", "还没"),
-        ("有", "没有"),
-        ("必须", "可选"),
-    ]
     contradiction_detected = any(
         left in answer_stripped and right in answer_stripped
-        for left, right in contradiction_pairs
+        for left, right in ANSWER_CONTRADICTION_PAIRS
     )
     if contradiction_detected:
         signals.append("contradiction_detected")
@@ -20785,69 +21073,36 @@ def evaluate_answer_depth(question: str, answer: str, dimension: str,
     # ---- 第三层：综合判断 ----
 
     # 计算追问得分（信号越多越需要追问）
-    signal_weights = {
-        "too_short": 0.4,
-        "vague_expression": 0.5,
-        "generic_answer": 0.8,
-        "option_only": 0.3,
-        "no_quantification": 0.2,
-        "single_selection": 0.2,
-        "contradiction_detected": 0.6,
-    }
-    follow_up_score = sum(signal_weights.get(s, 0.1) for s in signals)
+    follow_up_score = sum(FOLLOW_UP_SIGNAL_WEIGHTS.get(s, 0.1) for s in signals)
     follow_up_score *= sensitivity  # 应用维度敏感度
 
     # 减去充分度信号
-    sufficient_weights = {
-        "detailed_answer": 0.5,
-        "multi_point_answer": 0.3,
-        "quantified_answer": 0.2,
-        "rich_option_answer": 0.25 if normalized_evidence_intent == "high" else 0.18,
-    }
+    sufficient_weights = (
+        SUFFICIENT_SIGNAL_WEIGHTS_HIGH_EVIDENCE if normalized_evidence_intent == "high" else SUFFICIENT_SIGNAL_WEIGHTS
+    )
     sufficient_score = sum(sufficient_weights.get(s, 0) for s in sufficient_signals)
     follow_up_score -= sufficient_score
 
     hard_triggered = any(signal in HARD_FOLLOW_UP_SIGNALS for signal in signals)
 
-    # 判断结果
-    if follow_up_score >= 0.4:
-        # 明确需要追问
-        reason = _build_follow_up_reason(signals)
-        return {"needs_follow_up": True, "suggest_ai_eval": False,
-                "reason": reason, "signals": signals,
-                "hard_triggered": hard_triggered,
-                "has_numbers": has_numbers,
-                "follow_up_score": round(follow_up_score, 2)}
-    elif follow_up_score >= 0.15 and not sufficient_signals:
-        # 边界情况，建议让AI评估
-        reason = _build_follow_up_reason(signals)
-        return {"needs_follow_up": False, "suggest_ai_eval": True,
-                "reason": reason, "signals": signals,
-                "hard_triggered": hard_triggered,
-                "has_numbers": has_numbers,
-                "follow_up_score": round(follow_up_score, 2)}
-    else:
-        # 不需要追问
-        return {"needs_follow_up": False, "suggest_ai_eval": False,
-                "reason": None, "signals": signals,
-                "hard_triggered": hard_triggered,
-                "has_numbers": has_numbers,
-                "follow_up_score": round(follow_up_score, 2)}
+    # 判断结果：明确需要追问 / 边界情况建议让AI评估 / 不需要追问
+    needs_follow_up = follow_up_score >= 0.4
+    suggest_ai_eval = not needs_follow_up and follow_up_score >= 0.15 and not sufficient_signals
+    return {"needs_follow_up": needs_follow_up, "suggest_ai_eval": suggest_ai_eval,
+            "reason": _build_follow_up_reason(signals) if needs_follow_up or suggest_ai_eval else None,
+            "signals": signals,
+            "hard_triggered": hard_triggered,
+            "has_numbers": has_numbers,
+            "follow_up_score": round(follow_up_score, 2)}
 
 
 def _build_follow_up_reason(signals: list) -> str:
-    """根据检测到的信号构建追问原因"""
-    reason_map = {
-        "too_short": "回答过于简短，需要补充具体细节",
-        "vague_expression": "回答包含模糊表述，需要明确具体要求",
-        "generic_answer": "回答过于笼统，需要深入了解具体需求",
-        "option_only": "当前答案方向明确，但仍需补一个关键依据以支撑后续结论",
-        "no_quantification": "缺少量化指标，需要明确具体数据要求",
-        "single_selection": "只选择了单一选项，需要了解是否还有其他需求",
-        "contradiction_detected": "回答中存在前后冲突，需要澄清真实约束",
-    }
-    reasons = [reason_map.get(s, "") for s in signals if s in reason_map]
-    return reasons[0] if reasons else "需要进一步了解详细需求"
+    """根据检测到的信号构建追问原因（信号按检测顺序排列，取第一个有文案的）"""
+    for signal in signals:
+        reason = FOLLOW_UP_REASON_MESSAGES.get(signal)
+        if reason:
+            return reason
+    return FOLLOW_UP_REASON_FALLBACK
 
 
 def _infer_legacy_log_capture_contract(log: dict, prior_dim_logs: list) -> dict:
@@ -21083,38 +21338,40 @@ def build_assessment_report_prompt(session: dict) -> str:
             break
 
     # 构建评分表格文本
-    score_table = "| 维度 | 得分 | 权重 | 加权得分 |\n|:---|:---:|:---:|:---:|\n"
+    score_rows = ["| 维度 | 得分 | 权重 | 加权得分 |\n|:---|:---:|:---:|:---:|\n"]
     for info in dim_scores_info:
         weighted = round(info["score"] * info["weight"], 2)
-        score_table += f"| {info['name']} | {info['score']:.1f} | {info['weight']*100:.0f}% | {weighted:.2f} |\n"
-    score_table += f"| **综合得分** | **{final_score:.2f}** | 100% | **{final_score:.2f}** |"
+        score_rows.append(f"| {info['name']} | {info['score']:.1f} | {info['weight']*100:.0f}% | {weighted:.2f} |\n")
+    score_rows.append(f"| **综合得分** | **{final_score:.2f}** | 100% | **{final_score:.2f}** |")
+    score_table = "".join(score_rows)
 
     # 按维度整理问答和评分
-    qa_sections = ""
+    qa_parts = []
+    logs_by_dimension = group_interview_logs_by_dimension(interview_log)
     for dim_info in dim_scores_info:
-        dim_id = dim_info["id"]
-        qa_list = [log for log in interview_log if log.get("dimension") == dim_id]
-        qa_sections += f"\n### {dim_info['name']}（得分: {dim_info['score']:.1f}/5.0）\n"
+        qa_list = logs_by_dimension.get(dim_info["id"], [])
+        qa_parts.append(f"\n### {dim_info['name']}（得分: {dim_info['score']:.1f}/5.0）\n")
         for qa in qa_list:
-            qa_sections += f"**Q**: {qa['question']}\n"
-            qa_sections += f"**A**: {qa['answer']}\n"
+            qa_parts.append(f"**Q**: {qa['question']}\n")
+            qa_parts.append(f"**A**: {qa['answer']}\n")
             if qa.get("score"):
-                qa_sections += f"*单题评分: {qa['score']:.1f}*\n"
-            qa_sections += "\n"
+                qa_parts.append(f"*单题评分: {qa['score']:.1f}*\n")
+            qa_parts.append("\n")
+    qa_sections = "".join(qa_parts)
 
-    prompt = f"""你是一位资深的面试官和人才评估专家，需要基于以下访谈记录生成一份专业的面试评估报告。
+    prompt_parts = [f"""你是一位资深的面试官和人才评估专家，需要基于以下访谈记录生成一份专业的面试评估报告。
 
 ## 评估主题
 {topic}
-"""
+"""]
 
     if description:
-        prompt += f"""
+        prompt_parts.append(f"""
 ## 背景说明
 {description}
-"""
+""")
 
-    prompt += f"""
+    prompt_parts.append(f"""
 ## 各维度得分
 
 {score_table}
@@ -21176,9 +21433,9 @@ xychart-beta
 - 使用 Markdown 格式
 - 报告末尾使用署名：*此报告由 Deep Vision 深瞳生成*
 
-请生成完整的评估报告："""
+请生成完整的评估报告：""")
 
-    return prompt
+    return "".join(prompt_parts)
 
 
 def build_report_prompt(session: dict) -> str:
@@ -21400,35 +21657,33 @@ def build_report_prompt_with_options(session: dict, evidence_pack: Optional[dict
     # 获取会话的动态维度信息
     report_dim_info = get_dimension_info_for_session(session)
 
-    # 按维度整理问答
-    qa_by_dim = {}
-    for dim_key in report_dim_info:
-        qa_by_dim[dim_key] = [log for log in interview_log if log.get("dimension") == dim_key]
+    # 按维度整理问答（一次遍历分组）
+    qa_by_dim = group_interview_logs_by_dimension(interview_log)
 
-    prompt = f"""你是一个专业的需求分析师，需要基于以下访谈记录生成一份专业的访谈报告。
+    prompt_parts = [f"""你是一个专业的需求分析师，需要基于以下访谈记录生成一份专业的访谈报告。
 
 ## 访谈主题
 {topic}
-"""
+"""]
 
     # 如果有主题描述，添加到 prompt 中
     if description:
-        prompt += f"""
+        prompt_parts.append(f"""
 ## 主题描述
 {description}
-"""
+""")
 
-    prompt += """
+    prompt_parts.append("""
 ## 参考资料
-"""
+""")
 
     if reference_materials:
-        prompt += "以下是用户提供的参考资料，请在生成报告时参考这些内容：\n\n"
+        prompt_parts.append("以下是用户提供的参考资料，请在生成报告时参考这些内容：\n\n")
         for doc in reference_materials:
             doc_name = doc.get('name', '文档')
             # 根据 source 添加标记
             source_marker = "🔄 " if doc.get("source") == "auto" else ""
-            prompt += f"### {source_marker}{doc_name}\n"
+            prompt_parts.append(f"### {source_marker}{doc_name}\n")
             if doc.get("content"):
                 reference_selection_meta = {}
                 if doc.get("chunk_manifest_ref"):
@@ -21446,38 +21701,38 @@ def build_report_prompt_with_options(session: dict, evidence_pack: Optional[dict
                 if original_length > SMART_SUMMARY_THRESHOLD and ENABLE_SMART_SUMMARY:
                     processed_content, is_summarized = summarize_document(content, doc_name, topic)
                     if is_summarized:
-                        prompt += f"{processed_content}\n"
-                        prompt += f"*[原文档 {original_length} 字符，已通过AI生成摘要保留关键信息]*\n\n"
+                        prompt_parts.append(f"{processed_content}\n")
+                        prompt_parts.append(f"*[原文档 {original_length} 字符，已通过AI生成摘要保留关键信息]*\n\n")
                     elif len(processed_content) > MAX_DOC_LENGTH:
-                        prompt += f"{processed_content[:MAX_DOC_LENGTH]}\n"
-                        prompt += f"*[文档内容过长，已截取前 {MAX_DOC_LENGTH} 字符]*\n\n"
+                        prompt_parts.append(f"{processed_content[:MAX_DOC_LENGTH]}\n")
+                        prompt_parts.append(f"*[文档内容过长，已截取前 {MAX_DOC_LENGTH} 字符]*\n\n")
                     else:
-                        prompt += f"{processed_content}\n\n"
+                        prompt_parts.append(f"{processed_content}\n\n")
                 elif original_length > MAX_DOC_LENGTH:
-                    prompt += f"{content[:MAX_DOC_LENGTH]}\n"
-                    prompt += f"*[文档内容过长，已截取前 {MAX_DOC_LENGTH} 字符]*\n\n"
+                    prompt_parts.append(f"{content[:MAX_DOC_LENGTH]}\n")
+                    prompt_parts.append(f"*[文档内容过长，已截取前 {MAX_DOC_LENGTH} 字符]*\n\n")
                 else:
-                    prompt += f"{content}\n\n"
+                    prompt_parts.append(f"{content}\n\n")
                 if isinstance(reference_selection_meta, dict) and reference_selection_meta.get("mode") == "chunk_selection":
-                    prompt += (
+                    prompt_parts.append(
                         f"*[已从全文索引 {reference_selection_meta.get('chunk_count', 0)} 个片段中选取相关内容]*\n\n"
                     )
             else:
-                prompt += "*[文档内容为空]*\n\n"
+                prompt_parts.append("*[文档内容为空]*\n\n")
     else:
-        prompt += "无参考资料\n"
+        prompt_parts.append("无参考资料\n")
 
-    prompt += "\n## 访谈记录\n"
+    prompt_parts.append("\n## 访谈记录\n")
 
     for dim_key, dim_info in report_dim_info.items():
-        prompt += f"\n### {dim_info['name']}\n"
+        prompt_parts.append(f"\n### {dim_info['name']}\n")
         qa_list = qa_by_dim.get(dim_key, [])
         if qa_list:
             for qa in qa_list:
-                prompt += f"**Q**: {qa['question']}\n"
-                prompt += f"**A**: {qa['answer']}\n\n"
+                prompt_parts.append(f"**Q**: {qa['question']}\n")
+                prompt_parts.append(f"**A**: {qa['answer']}\n\n")
         else:
-            prompt += "*该维度暂无收集数据*\n"
+            prompt_parts.append("*该维度暂无收集数据*\n")
 
     if template_name == REPORT_TEMPLATE_CUSTOM_V1:
         normalized_schema, schema_issues = normalize_custom_report_schema(
@@ -21489,7 +21744,7 @@ def build_report_prompt_with_options(session: dict, evidence_pack: Optional[dict
         if schema_issues:
             schema_issue_notice = "\n- 原始模板存在异常配置，已自动回退为可解析章节。"
 
-        prompt += f"""
+        prompt_parts.append(f"""
 ## 报告要求
 
 请根据用户的自定义模板输出完整 Markdown 报告（不包含附录，附录会由系统自动追加）。
@@ -21505,9 +21760,9 @@ def build_report_prompt_with_options(session: dict, evidence_pack: Optional[dict
 5. flowchart 连接线标签必须使用 `A -->|标签| B` 语法。
 6. 报告末尾使用署名：*此报告由 Deep Vision 深瞳生成*{schema_issue_notice}
 
-请生成完整的报告："""
+请生成完整的报告：""")
     else:
-        prompt += """
+        prompt_parts.append("""
 ## 报告要求
 
 请生成一份专业的访谈报告，包含以下章节：
@@ -21677,9 +21932,13 @@ flowchart TD
 - **flowchart 连接线带标签语法必须是 `A -->|标签| B`，禁止使用 `A --|标签|--> B`**
 - 报告末尾使用署名：*此报告由 Deep Vision 深瞳生成*
 
-请生成完整的报告："""
+请生成完整的报告：""")
+
+    return "".join(prompt_parts)
+
 
-    return prompt
+# 括号配对只关心转义序列、引号和花括号，其余字符交给正则引擎在 C 层跳过
+_JSON_SCAN_TOKEN_PATTERN = re.compile(r'\\.|["{}]', re.DOTALL)
 
 
 def _extract_first_json_object(raw_text: str) -> Optional[str]:
@@ -21693,30 +21952,22 @@ def _extract_first_json_object(raw_text: str) -> Optional[str]:
 
     brace_count = 0
     in_string = False
-    escape_next = False
-
-    for i in range(json_start, len(raw_text)):
-        char = raw_text[i]
 
-        if escape_next:
-            escape_next = False
-            continue
-        if char == '\\':
-            escape_next = True
-            continue
-        if char == '"' and not escape_next:
+    for match in _JSON_SCAN_TOKEN_PATTERN.finditer(raw_text, json_start):
+        token = match.group()
+        if token == '"':
             in_string = not in_string
             continue
-
-        if in_string:
+        # 转义序列（反斜杠 + 任意字符）整体跳过
+        if in_string or len(token) == 2:
             continue
 
-        if char == '{':
+        if token == '{':
             brace_count += 1
-        elif char == '}':
+        else:
             brace_count -= 1
             if brace_count == 0:
-                return raw_text[json_start:i + 1]
+                return raw_text[json_start:match.end()]
 
     return None
 
@@ -21838,6 +22089,10 @@ def _repair_json_candidate(candidate: str) -> tuple[str, bool]:
     return normalized, repaired
 
 
+# 代码块（```json 或 ```）内的候选 JSON 文本
+_JSON_FENCE_BLOCK_PATTERN = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
+
+
 def parse_structured_json_response(
     raw_text: str,
     required_keys: Optional[list] = None,
@@ -21887,7 +22142,7 @@ def parse_structured_json_response(
 
     if "```" in text:
         try:
-            blocks = re.findall(r"```(?:json)?\s*([\s\S]*?)```", text)
+            blocks = _JSON_FENCE_BLOCK_PATTERN.findall(text)
             for block in blocks:
                 _append_candidate(block.strip(), "generic_fence")
         except Exception:
@@ -21900,6 +22155,8 @@ def parse_structured_json_response(
     if isinstance(parse_meta, dict):
         parse_meta["candidate_count"] = len(candidates)
 
+    # 修复后的文本可能与其他候选完全相同（如截取首个对象），同一文本只解析一次
+    tried_texts = set()
     for candidate, source in candidates:
         attempts = [(candidate, False, source)]
         repaired_candidate, repaired = _repair_json_candidate(candidate)
@@ -21907,6 +22164,9 @@ def parse_structured_json_response(
             attempts.append((repaired_candidate, True, f"{source}:repaired"))
 
         for attempt_text, repaired_flag, attempt_source in attempts:
+            if attempt_text in tried_texts:
+                continue
+            tried_texts.add(attempt_text)
             if isinstance(parse_meta, dict):
                 parse_meta["parse_attempts"] = int(parse_meta.get("parse_attempts", 0) or 0) + 1
 
@@ -21941,18 +22201,55 @@ def parse_structured_json_response(
     return None
 
 
+# 证据引用编号（大小写不敏感，只取数字部分，省去逐条 upper() 复制）
+_EVIDENCE_REF_PATTERN = re.compile(r"Q(\d+)", re.IGNORECASE)
+_CANONICAL_EVIDENCE_REF_PATTERN = re.compile(r"Q([1-9][0-9]*)")
+
+
+def _is_canonical_evidence_ref_list(raw_refs: list) -> bool:
+    """判断引用列表是否已是标准化结果（大写 Q、无前导零、按编号严格递增）。"""
+    previous_number = 0
+    for item in raw_refs:
+        match = _CANONICAL_EVIDENCE_REF_PATTERN.fullmatch(item) if isinstance(item, str) else None
+        if match is None:
+            return False
+        number = int(match.group(1))
+        if number <= previous_number:
+            return False
+        previous_number = number
+    return True
+
+
 def _normalize_evidence_refs(raw_refs) -> list:
     """标准化证据引用，统一为 Q数字 格式。"""
-    refs = []
+    # 校验后的草案会被修复、合并、质量评估与渲染反复读取，已标准化的列表直接复制返回
+    if isinstance(raw_refs, list) and _is_canonical_evidence_ref_list(raw_refs):
+        return list(raw_refs)
+    ref_numbers = set()
     if isinstance(raw_refs, str):
-        refs.extend(re.findall(r"Q\d+", raw_refs.upper()))
+        ref_numbers.update(int(num) for num in _EVIDENCE_REF_PATTERN.findall(raw_refs))
     elif isinstance(raw_refs, list):
         for item in raw_refs:
             if isinstance(item, str):
-                refs.extend(re.findall(r"Q\d+", item.upper()))
+                ref_numbers.update(int(num) for num in _EVIDENCE_REF_PATTERN.findall(item))
+
+    # 按编号数值去重排序，Q01 与 Q1 视为同一引用
+    return [f"Q{num}" for num in sorted(ref_numbers)]
 
-    dedup = sorted(set(refs), key=lambda ref: int(ref[1:]) if ref[1:].isdigit() else 10**9)
-    return dedup
+
+def _collect_valid_fact_refs(evidence_pack: dict) -> set:
+    """收集证据包 facts 中格式合法的 Q 编号集合（每条 q_id 只标准化一次）。"""
+    valid_q_refs = set()
+    facts = evidence_pack.get("facts", []) if isinstance(evidence_pack, dict) else []
+    if not isinstance(facts, list):
+        return valid_q_refs
+    for item in facts:
+        if not isinstance(item, dict):
+            continue
+        q_id = str(item.get("q_id", "")).upper().strip()
+        if _EVIDENCE_REF_PATTERN.fullmatch(q_id):
+            valid_q_refs.add(q_id)
+    return valid_q_refs
 
 
 _INLINE_EVIDENCE_MARKER_PATTERN = re.compile(
@@ -21999,6 +22296,21 @@ def classify_answer_evidence_class_v3(signals: list, quality_score: float, evide
     return "explicit"
 
 
+# 证据包中判定“回答存在模糊表述”的词表；合并为一条正则，每条回答只扫描一遍
+REPORT_EVIDENCE_VAGUE_TERMS = ("看情况", "不确定", "都可以", "不知道", "可能", "暂时不清楚", "以后再说", "差不多")
+REPORT_EVIDENCE_VAGUE_PATTERN = re.compile("|".join(re.escape(term) for term in REPORT_EVIDENCE_VAGUE_TERMS))
+REPORT_EVIDENCE_UNKNOWN_SIGNALS = frozenset({"vague_expression", "generic_answer"})
+
+# 证据包冲突检测词对：(pair_id, 正向词, 反向词, 冲突说明)
+REPORT_EVIDENCE_CONTRADICTION_PATTERNS = (
+    ("need", "需要", "不需要", "需求取向冲突"),
+    ("support", "支持", "不支持", "支持立场冲突"),
+    ("available", "有", "没有", "资源现状冲突"),
+    ("must", "必须", "可选", "约束优先级冲突"),
+    ("ready", "已经", "还没", "准备状态冲突"),
+)
+
+
 def build_report_evidence_pack(session: dict) -> dict:
     """构建报告 V3 证据包。"""
     normalized_session = copy.deepcopy(session) if isinstance(session, dict) else {}
@@ -22007,17 +22319,6 @@ def build_report_evidence_pack(session: dict) -> dict:
     dim_info = get_dimension_info_for_session(normalized_session)
     mode_config = get_interview_mode_config(normalized_session)
 
-    vague_terms = ["看情况", "不确定", "都可以", "不知道", "可能", "暂时不清楚", "以后再说", "差不多"]
-    unknown_signals = {"vague_expression", "generic_answer"}
-
-    contradiction_patterns = [
-        ("need", "需要", "不需要", "需求取向冲突"),
-        ("support", "支持", "不支持", "支持立场冲突"),
-        ("available", "有", "没有", "资源现状冲突"),
-        ("must", "必须", "可选", "约束优先级冲突"),
-        ("ready", "已经", "还没", "准备状态冲突"),
-    ]
-
     facts = []
     unknowns = []
     contradictions = []
@@ -22034,13 +22335,30 @@ def build_report_evidence_pack(session: dict) -> dict:
         "pending_follow_up": 0,
     }
 
-    for idx, log in enumerate(interview_log, 1):
-        q_id = f"Q{idx}"
+    # 维度名称在会话内固定，循环前建好映射，逐条记录直接查表
+    dim_name_map = {dim_key: info.get("name", dim_key or "未分类") for dim_key, info in dim_info.items()}
+    # 按维度归集事实与正式/追问计数，在同一次遍历中完成，后续维度循环直接取用
+    facts_by_dimension = {}
+    question_counts_by_dimension = {}
+    total_formal = 0
+    total_follow_up = 0
+    hard_triggered_count = 0
+
+    for idx, log in enumerate(interview_log, 1):
+        q_id = f"Q{idx}"
         dimension_key = log.get("dimension", "")
-        dim_name = dim_info.get(dimension_key, {}).get("name", dimension_key or "未分类")
+        dim_name = dim_name_map.get(dimension_key, dimension_key or "未分类")
         question = str(log.get("question", "")).strip()
         answer = str(log.get("answer", "")).strip()
-        signals = log.get("follow_up_signals") if isinstance(log.get("follow_up_signals"), list) else []
+        # 每条记录的字段只读取一次，后续事实构建与计数都复用局部变量
+        signals = log.get("follow_up_signals")
+        if not isinstance(signals, list):
+            signals = []
+        quality_signals = log.get("quality_signals")
+        if not isinstance(quality_signals, list):
+            quality_signals = []
+        is_follow_up = bool(log.get("is_follow_up", False))
+        hard_triggered = bool(log.get("hard_triggered", False))
         try:
             quality_score = float(log.get("quality_score", 0) or 0)
         except Exception:
@@ -22063,23 +22381,33 @@ def build_report_evidence_pack(session: dict) -> dict:
             "dimension_name": dim_name,
             "question": question,
             "answer": answer,
-            "is_follow_up": bool(log.get("is_follow_up", False)),
+            "is_follow_up": is_follow_up,
             "follow_up_round": int(log.get("follow_up_round", 0) or 0),
             "quality_score": quality_score,
-            "quality_signals": log.get("quality_signals", []) if isinstance(log.get("quality_signals"), list) else [],
+            "quality_signals": quality_signals,
             "follow_up_signals": signals,
-            "hard_triggered": bool(log.get("hard_triggered", False)),
+            "hard_triggered": hard_triggered,
             "answer_mode": answer_mode,
             "requires_rationale": requires_rationale,
             "evidence_intent": evidence_intent,
             "answer_evidence_class": answer_evidence_class,
         }
         facts.append(fact)
+        facts_by_dimension.setdefault(dimension_key, []).append(fact)
+        question_counts = question_counts_by_dimension.setdefault(dimension_key, [0, 0])
+        if is_follow_up:
+            question_counts[1] += 1
+            total_follow_up += 1
+        else:
+            question_counts[0] += 1
+            total_formal += 1
+        if hard_triggered:
+            hard_triggered_count += 1
 
         unknown_reasons = []
-        if answer_evidence_class != "rich_option" and any(signal in unknown_signals for signal in signals):
+        if answer_evidence_class != "rich_option" and any(signal in REPORT_EVIDENCE_UNKNOWN_SIGNALS for signal in signals):
             unknown_reasons.append("命中模糊回答信号")
-        if any(term in answer for term in vague_terms):
+        if REPORT_EVIDENCE_VAGUE_PATTERN.search(answer):
             unknown_reasons.append("回答存在模糊表述")
         if answer_evidence_class != "rich_option" and quality_score > 0 and quality_score < 0.45:
             unknown_reasons.append("回答质量偏低")
@@ -22094,9 +22422,12 @@ def build_report_evidence_pack(session: dict) -> dict:
                     "answer_excerpt": answer[:120],
                 })
 
-        for pair_id, positive, negative, description in contradiction_patterns:
+        for pair_id, positive, negative, description in REPORT_EVIDENCE_CONTRADICTION_PATTERNS:
             has_positive = positive in answer
             has_negative = negative in answer
+            # 多数回答不含任一极性词，直接跳过该词对
+            if not (has_positive or has_negative):
+                continue
 
             if has_positive and has_negative:
                 key = f"self:{pair_id}:{q_id}"
@@ -22111,9 +22442,6 @@ def build_report_evidence_pack(session: dict) -> dict:
                         "detail": f"{q_id} 同时出现「{positive}」与「{negative}」",
                     })
 
-            if not (has_positive or has_negative):
-                continue
-
             state = "positive" if has_positive else "negative"
             state_key = (dimension_key, pair_id)
             previous = contradiction_state.get(state_key)
@@ -22134,12 +22462,13 @@ def build_report_evidence_pack(session: dict) -> dict:
     dimension_coverage = {}
     coverage_values = []
     question_count_coverage_values = []
+    minimum_formal = mode_config.get("formal_questions_per_dim", 3)
+    maximum_formal = mode_config.get("max_formal_questions_per_dim", minimum_formal)
+    session_dimensions = session.get("dimensions", {})
     for dim_key, info in dim_info.items():
-        dim_logs = [log for log in interview_log if log.get("dimension") == dim_key]
-        dim_facts = [fact for fact in facts if fact.get("dimension") == dim_key]
-        formal_count = len([log for log in dim_logs if not log.get("is_follow_up", False)])
-        follow_up_count = len([log for log in dim_logs if log.get("is_follow_up", False)])
-        dim_state = session.get("dimensions", {}).get(dim_key, {})
+        dim_facts = facts_by_dimension.get(dim_key, [])
+        formal_count, follow_up_count = question_counts_by_dimension.get(dim_key, (0, 0))
+        dim_state = session_dimensions.get(dim_key, {})
         question_count_coverage_percent = int(dim_state.get("coverage", 0) or 0)
         question_count_ratio = max(0, min(100, question_count_coverage_percent)) / 100.0
         missing_aspects = get_dimension_missing_aspects(session, dim_key)
@@ -22177,8 +22506,8 @@ def build_report_evidence_pack(session: dict) -> dict:
             "raw_average_quality_score": round(dim_raw_average_quality, 3),
             "formal_count": formal_count,
             "follow_up_count": follow_up_count,
-            "minimum_formal": mode_config.get("formal_questions_per_dim", 3),
-            "maximum_formal": mode_config.get("max_formal_questions_per_dim", mode_config.get("formal_questions_per_dim", 3)),
+            "minimum_formal": minimum_formal,
+            "maximum_formal": maximum_formal,
             "missing_aspects": missing_aspects,
             "key_aspects": key_aspects,
         }
@@ -22193,9 +22522,6 @@ def build_report_evidence_pack(session: dict) -> dict:
     overall_coverage = sum(coverage_values) / len(coverage_values) if coverage_values else 0.0
     question_count_overall_coverage = sum(question_count_coverage_values) / len(question_count_coverage_values) if question_count_coverage_values else 0.0
 
-    total_formal = len([fact for fact in facts if not fact.get("is_follow_up", False)])
-    total_follow_up = len([fact for fact in facts if fact.get("is_follow_up", False)])
-
     report_template = resolve_report_template_for_session(session)
     report_cfg = (session.get("scenario_config", {}) or {}).get("report", {})
     if not isinstance(report_cfg, dict):
@@ -22225,7 +22551,7 @@ def build_report_evidence_pack(session: dict) -> dict:
             "average_quality_score": round(average_quality, 3),
             "raw_average_quality_score": round(average_quality, 3),
             "positive_only_average_quality_score": round(positive_only_average_quality, 3),
-            "hard_triggered_count": len([fact for fact in facts if fact.get("hard_triggered")]),
+            "hard_triggered_count": hard_triggered_count,
             "total_questions": len(facts),
             "total_formal_questions": total_formal,
             "total_follow_up_questions": total_follow_up,
@@ -22253,14 +22579,16 @@ def summarize_evidence_pack_for_debug(evidence_pack: dict) -> dict:
         for dim_key, dim_meta in raw_dimension_coverage.items():
             if not isinstance(dim_meta, dict):
                 continue
+            coverage_percent = dim_meta.get("coverage_percent", 0)
+            missing_aspects = dim_meta.get("missing_aspects", [])
             dimension_summary[dim_key] = {
                 "name": dim_meta.get("name", dim_key),
-                "coverage_percent": int(dim_meta.get("coverage_percent", 0) or 0),
-                "question_count_coverage_percent": int(dim_meta.get("question_count_coverage_percent", dim_meta.get("coverage_percent", 0)) or 0),
+                "coverage_percent": int(coverage_percent or 0),
+                "question_count_coverage_percent": int(dim_meta.get("question_count_coverage_percent", coverage_percent) or 0),
                 "quality_adjusted_coverage": float(dim_meta.get("quality_adjusted_coverage", 0.0) or 0.0),
                 "formal_count": int(dim_meta.get("formal_count", 0) or 0),
                 "follow_up_count": int(dim_meta.get("follow_up_count", 0) or 0),
-                "missing_aspects": (dim_meta.get("missing_aspects", []) if isinstance(dim_meta.get("missing_aspects", []), list) else [])[:8],
+                "missing_aspects": (missing_aspects if isinstance(missing_aspects, list) else [])[:8],
             }
 
     quality_snapshot = evidence_pack.get("quality_snapshot", {})
@@ -22427,59 +22755,9 @@ def select_slimmed_facts_for_prompt(evidence_pack: dict, facts_limit: int) -> li
     return selected_facts
 
 
-def build_report_draft_prompt_assessment_v1(
-    session: dict,
-    evidence_pack: dict,
-    facts_limit: int = 48,
-    contradiction_limit: int = 12,
-    unknown_limit: int = 12,
-    blindspot_limit: int = 12,
-) -> str:
-    """assessment_v1 草案提示词：强调候选人能力评估与录用建议。"""
-    topic = session.get("topic", "候选人评估")
-    description = session.get("description", "")
-    selected_facts = select_slimmed_facts_for_prompt(evidence_pack, facts_limit=max(8, int(facts_limit or 8)))
-    facts_lines = []
-    for fact in selected_facts:
-        question_text = (fact.get("question", "") or "").replace("\n", " ").strip()[:90]
-        answer_text = (fact.get("answer", "") or "").replace("\n", " ").strip()[:150]
-        facts_lines.append(
-            f"- {fact.get('q_id')} [{fact.get('dimension_name', '未分类')}] "
-            f"Q: {question_text} | A: {answer_text} | quality={fact.get('quality_score', 0):.2f} | evidence={fact.get('answer_evidence_class', 'explicit')}"
-        )
-    facts_text = "\n".join(facts_lines) if facts_lines else "- 无有效问答证据"
-
-    dimension_lines = []
-    for dim_key, dim_meta in (evidence_pack.get("dimension_coverage", {}) or {}).items():
-        missing = "、".join(dim_meta.get("missing_aspects", [])[:4]) if dim_meta.get("missing_aspects") else "无"
-        dimension_lines.append(
-            f"- {dim_meta.get('name', dim_key)}: 覆盖{dim_meta.get('coverage_percent', 0)}%，"
-            f"正式题 {dim_meta.get('formal_count', 0)}，追问 {dim_meta.get('follow_up_count', 0)}，未覆盖方面：{missing}"
-        )
-    dimension_text = "\n".join(dimension_lines) if dimension_lines else "- 暂无维度覆盖数据"
-
-    contradictions = evidence_pack.get("contradictions", [])
-    contradiction_lines = [
-        f"- {item.get('detail')}（证据: {', '.join(item.get('evidence_refs', []))}）"
-        for item in contradictions[:max(5, int(contradiction_limit or 5))]
-    ]
-    contradiction_text = "\n".join(contradiction_lines) if contradiction_lines else "- 未发现明显冲突"
-
-    unknowns = evidence_pack.get("unknowns", [])
-    unknown_lines = [
-        f"- {item.get('q_id')} [{item.get('dimension')}] {item.get('reason')}"
-        for item in unknowns[:max(5, int(unknown_limit or 5))]
-    ]
-    unknown_text = "\n".join(unknown_lines) if unknown_lines else "- 未发现明显模糊回答"
-
-    blindspots = evidence_pack.get("blindspots", [])
-    blindspot_lines = [
-        f"- {item.get('dimension')}: {item.get('aspect')}"
-        for item in blindspots[:max(5, int(blindspot_limit or 5))]
-    ]
-    blindspot_text = "\n".join(blindspot_lines) if blindspot_lines else "- 暂无盲区"
-
-    schema_example = {
+# 评估报告草案 JSON 模板为固定内容，导入时序列化一次
+_REPORT_DRAFT_ASSESSMENT_V1_SCHEMA_EXAMPLE_JSON = json.dumps(
+    {
         "overview": "候选人概览（1-2段）",
         "needs": [
             {
@@ -22544,7 +22822,63 @@ def build_report_draft_prompt_assessment_v1(
                 "evidence_refs": ["Q1", "Q5"]
             }
         ]
-    }
+    },
+    ensure_ascii=False,
+    indent=2,
+)
+
+
+def build_report_draft_prompt_assessment_v1(
+    session: dict,
+    evidence_pack: dict,
+    facts_limit: int = 48,
+    contradiction_limit: int = 12,
+    unknown_limit: int = 12,
+    blindspot_limit: int = 12,
+) -> str:
+    """assessment_v1 草案提示词：强调候选人能力评估与录用建议。"""
+    topic = session.get("topic", "候选人评估")
+    description = session.get("description", "")
+    selected_facts = select_slimmed_facts_for_prompt(evidence_pack, facts_limit=max(8, int(facts_limit or 8)))
+    facts_lines = []
+    for fact in selected_facts:
+        question_text = (fact.get("question", "") or "").replace("\n", " ").strip()[:90]
+        answer_text = (fact.get("answer", "") or "").replace("\n", " ").strip()[:150]
+        facts_lines.append(
+            f"- {fact.get('q_id')} [{fact.get('dimension_name', '未分类')}] "
+            f"Q: {question_text} | A: {answer_text} | quality={fact.get('quality_score', 0):.2f} | evidence={fact.get('answer_evidence_class', 'explicit')}"
+        )
+    facts_text = "\n".join(facts_lines) if facts_lines else "- 无有效问答证据"
+
+    dimension_lines = []
+    for dim_key, dim_meta in (evidence_pack.get("dimension_coverage", {}) or {}).items():
+        missing = "、".join(dim_meta.get("missing_aspects", [])[:4]) if dim_meta.get("missing_aspects") else "无"
+        dimension_lines.append(
+            f"- {dim_meta.get('name', dim_key)}: 覆盖{dim_meta.get('coverage_percent', 0)}%，"
+            f"正式题 {dim_meta.get('formal_count', 0)}，追问 {dim_meta.get('follow_up_count', 0)}，未覆盖方面：{missing}"
+        )
+    dimension_text = "\n".join(dimension_lines) if dimension_lines else "- 暂无维度覆盖数据"
+
+    contradictions = evidence_pack.get("contradictions", [])
+    contradiction_lines = [
+        f"- {item.get('detail')}（证据: {', '.join(item.get('evidence_refs', []))}）"
+        for item in contradictions[:max(5, int(contradiction_limit or 5))]
+    ]
+    contradiction_text = "\n".join(contradiction_lines) if contradiction_lines else "- 未发现明显冲突"
+
+    unknowns = evidence_pack.get("unknowns", [])
+    unknown_lines = [
+        f"- {item.get('q_id')} [{item.get('dimension')}] {item.get('reason')}"
+        for item in unknowns[:max(5, int(unknown_limit or 5))]
+    ]
+    unknown_text = "\n".join(unknown_lines) if unknown_lines else "- 未发现明显模糊回答"
+
+    blindspots = evidence_pack.get("blindspots", [])
+    blindspot_lines = [
+        f"- {item.get('dimension')}: {item.get('aspect')}"
+        for item in blindspots[:max(5, int(blindspot_limit or 5))]
+    ]
+    blindspot_text = "\n".join(blindspot_lines) if blindspot_lines else "- 暂无盲区"
 
     return f"""你是一名资深面试评估顾问。请基于证据包输出结构化草案 JSON，不要输出 JSON 之外任何文字。
 
@@ -22577,10 +22911,38 @@ def build_report_draft_prompt_assessment_v1(
 6. 禁止输出工具执行话术、markdown代码块与额外前后缀文本。
 
 ## JSON 模板（字段必须完整）
-{json.dumps(schema_example, ensure_ascii=False, indent=2)}
+{_REPORT_DRAFT_ASSESSMENT_V1_SCHEMA_EXAMPLE_JSON}
 """
 
 
+# 自定义模板草案 JSON 模板为固定内容，导入时序列化一次
+_REPORT_DRAFT_CUSTOM_V1_SCHEMA_EXAMPLE_JSON = json.dumps(
+    {
+        "overview": "执行摘要",
+        "needs": [],
+        "analysis": {
+            "customer_needs": "",
+            "business_flow": "",
+            "tech_constraints": "",
+            "project_constraints": ""
+        },
+        "visualizations": {
+            "priority_quadrant_mermaid": "",
+            "business_flow_mermaid": "",
+            "demand_pie_mermaid": "",
+            "architecture_mermaid": ""
+        },
+        "solutions": [],
+        "risks": [],
+        "actions": [],
+        "open_questions": [],
+        "evidence_index": []
+    },
+    ensure_ascii=False,
+    indent=2,
+)
+
+
 def build_report_draft_prompt_custom_v1(
     session: dict,
     evidence_pack: dict,
@@ -22629,28 +22991,6 @@ def build_report_draft_prompt_custom_v1(
     ]
     blindspot_text = "\n".join(blindspot_lines) if blindspot_lines else "- 暂无盲区"
 
-    schema_example = {
-        "overview": "执行摘要",
-        "needs": [],
-        "analysis": {
-            "customer_needs": "",
-            "business_flow": "",
-            "tech_constraints": "",
-            "project_constraints": ""
-        },
-        "visualizations": {
-            "priority_quadrant_mermaid": "",
-            "business_flow_mermaid": "",
-            "demand_pie_mermaid": "",
-            "architecture_mermaid": ""
-        },
-        "solutions": [],
-        "risks": [],
-        "actions": [],
-        "open_questions": [],
-        "evidence_index": []
-    }
-
     return f"""你是一名企业咨询顾问，需要基于证据包输出结构化草案 JSON。
 
 ## 任务类型
@@ -22682,10 +23022,102 @@ def build_report_draft_prompt_custom_v1(
 6. 文案需简洁可交付，避免口语化、避免空泛叙述。
 
 ## JSON 模板（字段必须完整）
-{json.dumps(schema_example, ensure_ascii=False, indent=2)}
+{_REPORT_DRAFT_CUSTOM_V1_SCHEMA_EXAMPLE_JSON}
 """
 
 
+# V3 草案 JSON 模板（完整版 / 紧凑版）为固定内容，导入时序列化一次
+_REPORT_DRAFT_V3_SCHEMA_EXAMPLE_JSON = json.dumps(
+    {
+        "overview": "访谈概述（2-4段）",
+        "needs": [
+            {
+                "name": "核心需求名称",
+                "priority": "P0",
+                "description": "需求描述",
+                "evidence_refs": ["Q1", "Q3"]
+            }
+        ],
+        "analysis": {
+            "customer_needs": "客户/用户需求分析",
+            "business_flow": "业务流程分析",
+            "tech_constraints": "技术约束分析",
+            "project_constraints": "项目约束分析"
+        },
+        "visualizations": {
+            "priority_quadrant_mermaid": "可选，quadrantChart ...",
+            "business_flow_mermaid": "可选，flowchart TD ...",
+            "demand_pie_mermaid": "可选，pie title ...",
+            "architecture_mermaid": "可选，flowchart LR ..."
+        },
+        "solutions": [
+            {
+                "title": "方案建议标题",
+                "description": "方案说明",
+                "owner": "负责角色",
+                "timeline": "时间计划",
+                "metric": "验收指标",
+                "evidence_refs": ["Q2", "Q8"]
+            }
+        ],
+        "risks": [
+            {
+                "risk": "风险项",
+                "impact": "影响",
+                "mitigation": "缓解措施",
+                "evidence_refs": ["Q6"]
+            }
+        ],
+        "actions": [
+            {
+                "action": "下一步行动",
+                "owner": "负责人角色",
+                "timeline": "预计时间",
+                "metric": "完成标准",
+                "evidence_refs": ["Q4"]
+            }
+        ],
+        "open_questions": [
+            {
+                "question": "未决问题",
+                "reason": "为何未决",
+                "impact": "影响范围",
+                "suggested_follow_up": "建议补充追问",
+                "evidence_refs": ["Q7"]
+            }
+        ],
+        "evidence_index": [
+            {
+                "claim": "关键结论",
+                "confidence": "high",
+                "evidence_refs": ["Q1", "Q5"]
+            }
+        ]
+    },
+    ensure_ascii=False,
+    indent=2,
+)
+_REPORT_DRAFT_V3_COMPACT_SCHEMA_EXAMPLE_JSON = json.dumps(
+    {
+        "overview": "访谈概述",
+        "needs": [{"name": "需求", "priority": "P0", "description": "描述", "evidence_refs": ["Q1"]}],
+        "analysis": {
+            "customer_needs": "客户需求分析",
+            "business_flow": "业务流程分析",
+            "tech_constraints": "技术约束分析",
+            "project_constraints": "项目约束分析"
+        },
+        "solutions": [{"title": "方案", "description": "说明", "owner": "角色", "timeline": "短期", "metric": "指标", "evidence_refs": ["Q2"]}],
+        "risks": [{"risk": "风险", "impact": "影响", "mitigation": "缓解", "evidence_refs": ["Q3"]}],
+        "actions": [{"action": "行动", "owner": "角色", "timeline": "短期/中期", "metric": "验收口径", "evidence_refs": ["Q4"]}],
+        "open_questions": [{"question": "待补问题", "reason": "原因", "impact": "影响", "suggested_follow_up": "追问方向", "evidence_refs": ["Q5"]}],
+        "evidence_index": [{"claim": "关键结论", "confidence": "high", "evidence_refs": ["Q1", "Q2"]}],
+    },
+    ensure_ascii=False,
+    indent=2,
+)
+
+
 def build_report_draft_prompt_v3(
     session: dict,
     evidence_pack: dict,
@@ -22737,10 +23169,10 @@ def build_report_draft_prompt_v3(
     blindspot_limit = max(4 if compact_mode else 5, int(blindspot_limit or (4 if compact_mode else 5)))
 
     selected_facts = select_slimmed_facts_for_prompt(evidence_pack, facts_limit=facts_limit)
+    question_max = 54 if compact_mode else 90
+    answer_max = 96 if compact_mode else 150
     facts_lines = []
     for fact in selected_facts:
-        question_max = 54 if compact_mode else 90
-        answer_max = 96 if compact_mode else 150
         question_text = (fact.get("question", "") or "").replace("\n", " ").strip()[:question_max]
         answer_text = (fact.get("answer", "") or "").replace("\n", " ").strip()[:answer_max]
         facts_lines.append(
@@ -22791,89 +23223,7 @@ def build_report_draft_prompt_v3(
     else:
         action_constraint = "actions 至少 3 条（证据不足时至少 2 条），且 timeline 需覆盖短期与中期里程碑。"
 
-    schema_example = {
-        "overview": "访谈概述（2-4段）",
-        "needs": [
-            {
-                "name": "核心需求名称",
-                "priority": "P0",
-                "description": "需求描述",
-                "evidence_refs": ["Q1", "Q3"]
-            }
-        ],
-        "analysis": {
-            "customer_needs": "客户/用户需求分析",
-            "business_flow": "业务流程分析",
-            "tech_constraints": "技术约束分析",
-            "project_constraints": "项目约束分析"
-        },
-        "visualizations": {
-            "priority_quadrant_mermaid": "可选，quadrantChart ...",
-            "business_flow_mermaid": "可选，flowchart TD ...",
-            "demand_pie_mermaid": "可选，pie title ...",
-            "architecture_mermaid": "可选，flowchart LR ..."
-        },
-        "solutions": [
-            {
-                "title": "方案建议标题",
-                "description": "方案说明",
-                "owner": "负责角色",
-                "timeline": "时间计划",
-                "metric": "验收指标",
-                "evidence_refs": ["Q2", "Q8"]
-            }
-        ],
-        "risks": [
-            {
-                "risk": "风险项",
-                "impact": "影响",
-                "mitigation": "缓解措施",
-                "evidence_refs": ["Q6"]
-            }
-        ],
-        "actions": [
-            {
-                "action": "下一步行动",
-                "owner": "负责人角色",
-                "timeline": "预计时间",
-                "metric": "完成标准",
-                "evidence_refs": ["Q4"]
-            }
-        ],
-        "open_questions": [
-            {
-                "question": "未决问题",
-                "reason": "为何未决",
-                "impact": "影响范围",
-                "suggested_follow_up": "建议补充追问",
-                "evidence_refs": ["Q7"]
-            }
-        ],
-        "evidence_index": [
-            {
-                "claim": "关键结论",
-                "confidence": "high",
-                "evidence_refs": ["Q1", "Q5"]
-            }
-        ]
-    }
-
-    if compact_mode:
-        schema_example = {
-            "overview": "访谈概述",
-            "needs": [{"name": "需求", "priority": "P0", "description": "描述", "evidence_refs": ["Q1"]}],
-            "analysis": {
-                "customer_needs": "客户需求分析",
-                "business_flow": "业务流程分析",
-                "tech_constraints": "技术约束分析",
-                "project_constraints": "项目约束分析"
-            },
-            "solutions": [{"title": "方案", "description": "说明", "owner": "角色", "timeline": "短期", "metric": "指标", "evidence_refs": ["Q2"]}],
-            "risks": [{"risk": "风险", "impact": "影响", "mitigation": "缓解", "evidence_refs": ["Q3"]}],
-            "actions": [{"action": "行动", "owner": "角色", "timeline": "短期/中期", "metric": "验收口径", "evidence_refs": ["Q4"]}],
-            "open_questions": [{"question": "待补问题", "reason": "原因", "impact": "影响", "suggested_follow_up": "追问方向", "evidence_refs": ["Q5"]}],
-            "evidence_index": [{"claim": "关键结论", "confidence": "high", "evidence_refs": ["Q1", "Q2"]}],
-        }
+    schema_example_json = _REPORT_DRAFT_V3_COMPACT_SCHEMA_EXAMPLE_JSON if compact_mode else _REPORT_DRAFT_V3_SCHEMA_EXAMPLE_JSON
 
     return f"""你是一名资深分析顾问。请基于给定证据包生成一份结构化报告草案 JSON，禁止输出任何 JSON 之外的文字。
 
@@ -22925,7 +23275,7 @@ def build_report_draft_prompt_v3(
 - open_questions 必须对齐盲区或冲突，避免泛化问题。
 
 ## JSON 模板（字段必须完整）
-{json.dumps(schema_example, ensure_ascii=False, indent=2)}
+{schema_example_json}
 """
 
 
@@ -22977,6 +23327,16 @@ def is_custom_report_source_empty_v3(value: object) -> bool:
     return False
 
 
+# V3 草案列表字段：(字段名, 标识字段, 需要清洗的附加文本字段)
+_REPORT_DRAFT_V3_LIST_FIELD_SPECS = (
+    ("solutions", "title", ("owner", "timeline", "metric")),
+    ("risks", "risk", ("impact", "mitigation")),
+    ("actions", "action", ("owner", "timeline", "metric")),
+    ("open_questions", "question", ("reason", "impact", "suggested_follow_up")),
+    ("evidence_index", "claim", ()),
+)
+
+
 def validate_report_draft_v3(draft: dict, evidence_pack: dict) -> tuple[dict, list]:
     """校验并标准化 V3 报告草案。"""
     issues = []
@@ -23022,11 +23382,7 @@ def validate_report_draft_v3(draft: dict, evidence_pack: dict) -> tuple[dict, li
         "evidence_index": [],
     }
 
-    valid_q_refs = {
-        str(item.get("q_id", "")).upper().strip()
-        for item in evidence_pack.get("facts", [])
-        if isinstance(item, dict) and re.fullmatch(r"Q\d+", str(item.get("q_id", "")).upper().strip())
-    }
+    valid_q_refs = _collect_valid_fact_refs(evidence_pack)
 
     def normalize_evidence_refs_for_target(raw_refs, target: str) -> list:
         refs = _normalize_evidence_refs(raw_refs)
@@ -23082,7 +23438,7 @@ def validate_report_draft_v3(draft: dict, evidence_pack: dict) -> tuple[dict, li
                 add_issue("no_evidence", "high", "核心需求缺少证据引用", f"needs[{idx}]")
             normalized["needs"].append(normalized_item)
 
-    for field, id_field in [("solutions", "title"), ("risks", "risk"), ("actions", "action"), ("open_questions", "question"), ("evidence_index", "claim")]:
+    for field, id_field, text_fields in _REPORT_DRAFT_V3_LIST_FIELD_SPECS:
         values = draft.get(field, [])
         if not isinstance(values, list):
             add_issue("structure_error", "medium", f"{field} 必须是数组", field)
@@ -23099,23 +23455,13 @@ def validate_report_draft_v3(draft: dict, evidence_pack: dict) -> tuple[dict, li
             if refs and not normalized_item["evidence_binding_mode"]:
                 normalized_item["evidence_binding_mode"] = "strong_explicit"
 
+            for text_field in text_fields:
+                normalized_item[text_field] = sanitize_text(item.get(text_field, ""))
+
             if field in {"solutions", "actions"}:
-                normalized_item["owner"] = sanitize_text(item.get("owner", ""))
-                normalized_item["timeline"] = sanitize_text(item.get("timeline", ""))
-                normalized_item["metric"] = sanitize_text(item.get("metric", ""))
                 if not (normalized_item["owner"] and normalized_item["timeline"] and normalized_item["metric"]):
                     add_issue("not_actionable", "medium", f"{field} 缺少 owner/timeline/metric", f"{field}[{idx}]")
-
-            if field == "risks":
-                normalized_item["impact"] = sanitize_text(item.get("impact", ""))
-                normalized_item["mitigation"] = sanitize_text(item.get("mitigation", ""))
-
-            if field == "open_questions":
-                normalized_item["reason"] = sanitize_text(item.get("reason", ""))
-                normalized_item["impact"] = sanitize_text(item.get("impact", ""))
-                normalized_item["suggested_follow_up"] = sanitize_text(item.get("suggested_follow_up", ""))
-
-            if field == "evidence_index":
+            elif field == "evidence_index":
                 confidence = str(item.get("confidence", "medium")).strip().lower()
                 if confidence not in {"high", "medium", "low"}:
                     confidence = "medium"
@@ -23132,15 +23478,11 @@ def validate_report_draft_v3(draft: dict, evidence_pack: dict) -> tuple[dict, li
             normalized[field].append(normalized_item)
 
     contradictions = evidence_pack.get("contradictions", [])
+    # normalized 中各条目的 evidence_refs 已在上方标准化并过滤，直接并入引用池
     contradiction_ref_pool = set()
     for field in ["risks", "open_questions", "actions", "solutions", "evidence_index"]:
-        values = normalized.get(field, [])
-        if not isinstance(values, list):
-            continue
-        for item in values:
-            if not isinstance(item, dict):
-                continue
-            contradiction_ref_pool.update(_normalize_evidence_refs(item.get("evidence_refs", [])))
+        for item in normalized[field]:
+            contradiction_ref_pool.update(item["evidence_refs"])
 
     unresolved_conflicts = 0
     for item in contradictions:
@@ -23158,12 +23500,7 @@ def validate_report_draft_v3(draft: dict, evidence_pack: dict) -> tuple[dict, li
     blindspot_text_segments = []
     blindspot_text_segments.extend(str(value or "") for value in normalized.get("analysis", {}).values())
     for field in ["open_questions", "actions", "solutions", "risks"]:
-        values = normalized.get(field, [])
-        if not isinstance(values, list):
-            continue
-        for item in values:
-            if not isinstance(item, dict):
-                continue
+        for item in normalized[field]:
             blindspot_text_segments.extend([
                 str(item.get("question", "") or ""),
                 str(item.get("reason", "") or ""),
@@ -23240,6 +23577,10 @@ def _report_review_response_schema_v3() -> dict:
     }
 
 
+# 审稿输出模板为固定内容，导入时序列化一次，审稿与修复 Prompt 共用
+_REPORT_REVIEW_RESPONSE_SCHEMA_V3_JSON = json.dumps(_report_review_response_schema_v3(), ensure_ascii=False, indent=2)
+
+
 def build_report_review_prompt_v3(session: dict, evidence_pack: dict, draft: dict, issues: list) -> str:
     """构建 V3 审稿与修复 Prompt。"""
     topic = session.get("topic", "未知主题")
@@ -23254,8 +23595,6 @@ def build_report_review_prompt_v3(session: dict, evidence_pack: dict, draft: dic
         [f"- [{item.get('severity', 'medium')}] {item.get('type')}: {item.get('message')} @ {item.get('target', 'unknown')}" for item in issues[:30]]
     ) or "- 无已知问题"
 
-    response_schema = _report_review_response_schema_v3()
-
     return f"""你是报告质量审稿专家。请对草案执行一致性审稿并直接修复，输出 JSON。
 
 ## 访谈主题
@@ -23300,7 +23639,7 @@ def build_report_review_prompt_v3(session: dict, evidence_pack: dict, draft: dic
 - 禁止输出 markdown 代码块与额外说明，禁止前后缀文本。
 
 ## 输出模板
-{json.dumps(response_schema, ensure_ascii=False, indent=2)}
+{_REPORT_REVIEW_RESPONSE_SCHEMA_V3_JSON}
 """
 
 
@@ -23309,8 +23648,6 @@ def build_report_review_repair_prompt_v3(raw_review: str, draft: dict, review_is
     issue_text = "\n".join(
         [f"- [{item.get('severity', 'medium')}] {item.get('type')}: {item.get('message')} @ {item.get('target', 'unknown')}" for item in review_issues[:20]]
     ) or "- 无已知问题"
-    response_schema = _report_review_response_schema_v3()
-
     return f"""你是 JSON 修复助手。以下内容是上一轮审稿模型的原始输出，但当前系统无法解析。
 
 你的任务不是重新长篇审稿，而是基于原始输出和当前草案，整理出一个合法 JSON。
@@ -23334,7 +23671,7 @@ def build_report_review_repair_prompt_v3(raw_review: str, draft: dict, review_is
 - 如果原始输出信息不足，请保守返回 passed=false，并在 issues 中说明无法解析的关键问题。
 
 ## 输出模板
-{json.dumps(response_schema, ensure_ascii=False, indent=2)}
+{_REPORT_REVIEW_RESPONSE_SCHEMA_V3_JSON}
 """
 
 
@@ -24145,7 +24482,7 @@ def merge_review_and_local_issues_v3(
         if not isinstance(item, dict):
             continue
         normalized = _normalize_review_issue_payload_v3(item)
-        key = f"{normalized.get('type')}|{normalized.get('target')}|{normalized.get('message')}"
+        key = (normalized.get("type"), normalized.get("target"), normalized.get("message"))
         if key in seen_keys:
             continue
         seen_keys.add(key)
@@ -25005,11 +25342,7 @@ def apply_deterministic_report_repairs_v3(
             changed = True
 
     # 统一清洗 evidence_refs：去重 + 移除无效 Q 编号。
-    valid_q_refs = {
-        str(fact.get("q_id", "")).upper().strip()
-        for fact in (evidence_pack.get("facts", []) if isinstance(evidence_pack.get("facts", []), list) else [])
-        if isinstance(fact, dict) and re.fullmatch(r"Q\d+", str(fact.get("q_id", "")).upper().strip())
-    }
+    valid_q_refs = _collect_valid_fact_refs(evidence_pack)
     for field in ["needs", "solutions", "risks", "actions", "open_questions", "evidence_index"]:
         values = working.get(field, [])
         if not isinstance(values, list):
@@ -25082,6 +25415,17 @@ REPORT_V3_QUALITY_THRESHOLDS = {
     "max_weak_binding_ratio": 0.35,
 }
 
+# 质量门禁检查项：(质量指标, 问题类型, 展示名称, 问题定位)
+REPORT_V3_QUALITY_GATE_CHECKS = (
+    ("evidence_coverage", "quality_gate_evidence", "证据覆盖率", "needs/solutions/actions/risks/evidence_index"),
+    ("consistency", "quality_gate_consistency", "冲突解释完成度", "risks/open_questions"),
+    ("actionability", "quality_gate_actionability", "可执行建议占比", "solutions/actions"),
+    ("expression_structure", "quality_gate_expression", "表达结构完整度", "overview/analysis/needs/solutions/risks/actions"),
+    ("table_readiness", "quality_gate_table", "表格化可读性", "needs/solutions/risks/actions"),
+    ("action_acceptance", "quality_gate_acceptance", "行动验收口径完备度", "actions.metric"),
+    ("milestone_coverage", "quality_gate_milestone", "行动里程碑覆盖度", "actions.timeline"),
+)
+
 
 def _profile_quality_gate_thresholds_v3(profile: str, base_thresholds: Optional[dict] = None) -> dict:
     """按档位返回质量门禁阈值。quality 更严格，balanced 适度放宽。"""
@@ -25221,18 +25565,8 @@ def build_quality_gate_issues_v3(quality_meta: dict, thresholds: Optional[dict]
     limit = _profile_quality_gate_thresholds_v3(runtime_profile, base_thresholds=thresholds)
     limit = _adapt_quality_gate_thresholds_by_evidence_v3(limit, quality_meta)
 
-    checks = [
-        ("evidence_coverage", "quality_gate_evidence", "证据覆盖率", "needs/solutions/actions/risks/evidence_index"),
-        ("consistency", "quality_gate_consistency", "冲突解释完成度", "risks/open_questions"),
-        ("actionability", "quality_gate_actionability", "可执行建议占比", "solutions/actions"),
-        ("expression_structure", "quality_gate_expression", "表达结构完整度", "overview/analysis/needs/solutions/risks/actions"),
-        ("table_readiness", "quality_gate_table", "表格化可读性", "needs/solutions/risks/actions"),
-        ("action_acceptance", "quality_gate_acceptance", "行动验收口径完备度", "actions.metric"),
-        ("milestone_coverage", "quality_gate_milestone", "行动里程碑覆盖度", "actions.timeline"),
-    ]
-
     issues = []
-    for key, issue_type, label, target in checks:
+    for key, issue_type, label, target in REPORT_V3_QUALITY_GATE_CHECKS:
         current = float(quality_meta.get(key, 0) or 0)
         required = float(limit.get(key, 0) or 0)
         if current + 1e-9 < required:
@@ -26149,6 +26483,15 @@ def render_report_from_draft_assessment_v1(session: dict, draft: dict, quality_m
     return "\n".join(lines)
 
 
+# 优先级矩阵中各优先级的基准坐标（紧急程度, 重要程度），未知优先级按 P1 处理
+REPORT_PRIORITY_QUADRANT_ANCHORS = {
+    "P0": (0.84, 0.88),  # 右上：立即执行
+    "P1": (0.66, 0.74),  # 偏上：计划执行
+    "P2": (0.72, 0.40),  # 右下：可委派
+    "P3": (0.34, 0.30),  # 左下：低优先级
+}
+
+
 def render_report_from_draft_v3(session: dict, draft: dict, quality_meta: dict) -> str:
     """将 V3 结构化草案渲染为 Markdown 报告。"""
     template_name = resolve_report_template_for_session(session)
@@ -26199,20 +26542,11 @@ def render_report_from_draft_v3(session: dict, draft: dict, quality_meta: dict)
     Req3: [0.36, 0.32]"""
             return fallback_matrix, []
 
-        priority_anchor = {
-            "P0": (0.84, 0.88),  # 右上：立即执行
-            "P1": (0.66, 0.74),  # 偏上：计划执行
-            "P2": (0.72, 0.40),  # 右下：可委派
-            "P3": (0.34, 0.30),  # 左下：低优先级
-        }
-
         point_lines = []
         point_legend = []
         for index, item in enumerate(needs_items[:10], 1):
             priority = str(item.get("priority", "P1")).upper()
-            if priority not in priority_anchor:
-                priority = "P1"
-            base_x, base_y = priority_anchor[priority]
+            base_x, base_y = REPORT_PRIORITY_QUADRANT_ANCHORS.get(priority, REPORT_PRIORITY_QUADRANT_ANCHORS["P1"])
             spread = ((index % 4) - 1.5) * 0.03
             x = clamp_score(base_x + spread)
             y = clamp_score(base_y - spread * 0.7)
@@ -26520,6 +26854,17 @@ def generate_report_v3_pipeline(
         report_profile=report_profile,
     )
 
+
+# 视觉描述 data URL 按扩展名选择的 MIME 类型，未知扩展名按 image/jpeg 处理
+VISION_IMAGE_MIME_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp'
+}
+
+
 def describe_image_with_vision(image_path: Path, filename: str) -> str:
     """
     使用智谱视觉模型描述图片内容
@@ -26538,25 +26883,25 @@ def describe_image_with_vision(image_path: Path, filename: str) -> str:
         return f"[图片: {filename}] (视觉 API 未配置)"
 
     try:
-        # 读取图片并转换为 base64
-        with open(image_path, "rb") as f:
-            image_data = f.read()
-
-        # 检查文件大小
-        size_mb = len(image_data) / (1024 * 1024)
+        # 先按文件元信息检查大小，超限图片无需读入内存
+        size_mb = image_path.stat().st_size / (1024 * 1024)
         if size_mb > MAX_IMAGE_SIZE_MB:
             return f"[图片: {filename}] (文件过大: {size_mb:.1f}MB > {MAX_IMAGE_SIZE_MB}MB)"
 
+        # 读取图片并转换为 base64
+        image_data = image_path.read_bytes()
+
+        # 同一图片重复上传时按内容复用已生成的描述，与文档摘要共用缓存存储
+        vision_cache_key = get_document_hash(
+            f"vision|{VISION_MODEL_NAME}|{hashlib.sha256(image_data).hexdigest()}"
+        )
+        cached_description = get_cached_summary(vision_cache_key)
+        if cached_description:
+            _record_cache_hit_metric("vision_describe_cache_hit")
+            return f"[图片: {filename}]\n\n**AI 图片描述:**\n{cached_description}"
+
         # 确定 MIME 类型
-        ext = Path(filename).suffix.lower()
-        mime_types = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.webp': 'image/webp'
-        }
-        mime_type = mime_types.get(ext, 'image/jpeg')
+        mime_type = VISION_IMAGE_MIME_TYPES.get(Path(filename).suffix.lower(), 'image/jpeg')
 
         base64_image = base64.b64encode(image_data).decode('utf-8')
 
@@ -26610,6 +26955,7 @@ def describe_image_with_vision(image_path: Path, filename: str) -> str:
             if description:
                 if ENABLE_DEBUG_LOG:
                     print(f"✅ 图片描述生成成功: {len(description)} 字符")
+                save_summary_cache(vision_cache_key, description)
                 return f"[图片: {filename}]\n\n**AI 图片描述:**\n{description}"
             else:
                 return f"[图片: {filename}] (描述生成失败: 空响应)"
@@ -26675,8 +27021,6 @@ def _call_claude_internal(prompt: str, max_tokens: int = None, retry_on_timeout:
                          hedge_triggered: bool = False, cache_hit: bool = False,
                          strict_preferred_lane: bool = False) -> tuple[Optional[str], dict]:
     """同步调用 AI 网关，返回文本与执行元信息。"""
-    import time
-
     effective_client, selected_lane, lane_meta = resolve_ai_client_with_lane(
         call_type=call_type,
         model_name=model_name,
@@ -26701,7 +27045,7 @@ def _call_claude_internal(prompt: str, max_tokens: int = None, retry_on_timeout:
         return None, call_meta
 
     generation_stage = resolve_generation_stage(call_type=call_type)
-    start_time = time.time()
+    start_time = _time.time()
     success = False
     timeout_occurred = False
     error_message = None
@@ -26836,7 +27180,7 @@ def _call_claude_internal(prompt: str, max_tokens: int = None, retry_on_timeout:
             call_meta["error_message"] = ""
             call_meta["empty_text"] = False
 
-        response_time = time.time() - start_time
+        response_time = _time.time() - start_time
         metrics_collector.record_api_call(
             call_type=call_type,
             prompt_length=len(prompt),
@@ -27571,6 +27915,62 @@ def delete_custom_scenario(scenario_id):
     return jsonify({"success": True})
 
 
+def _build_scenario_recognition_cache_key(model_name: str, prompt: str) -> str:
+    # Prompt 已包含主题、描述与当前用户可访问的场景列表，场景变化时自然失配
+    raw = f"{str(model_name or '').strip()}\n{str(prompt or '')}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _get_scenario_recognition_cache(cache_key: str) -> Optional[dict]:
+    if SCENARIO_RECOGNITION_CACHE_TTL_SECONDS <= 0:
+        return None
+    key = str(cache_key or "").strip()
+    if not key:
+        return None
+    now_ts = _time.time()
+    with scenario_recognition_cache_lock:
+        cached = scenario_recognition_cache.get(key)
+        if not isinstance(cached, dict):
+            return None
+        expire_at = float(cached.get("expire_at", 0.0) or 0.0)
+        if expire_at <= now_ts:
+            scenario_recognition_cache.pop(key, None)
+            return None
+        value = cached.get("value")
+        if isinstance(value, dict):
+            return dict(value)
+        return None
+
+
+def _set_scenario_recognition_cache(cache_key: str, value: dict) -> None:
+    if SCENARIO_RECOGNITION_CACHE_TTL_SECONDS <= 0:
+        return
+    key = str(cache_key or "").strip()
+    if not key or not isinstance(value, dict):
+        return
+    now_ts = _time.time()
+    expire_at = now_ts + float(SCENARIO_RECOGNITION_CACHE_TTL_SECONDS)
+    with scenario_recognition_cache_lock:
+        expired_keys = [
+            item_key
+            for item_key, cached in scenario_recognition_cache.items()
+            if float((cached or {}).get("expire_at", 0.0) or 0.0) <= now_ts
+        ]
+        for item_key in expired_keys:
+            scenario_recognition_cache.pop(item_key, None)
+
+        while len(scenario_recognition_cache) >= SCENARIO_RECOGNITION_CACHE_MAX_ENTRIES:
+            oldest_key = next(iter(scenario_recognition_cache), None)
+            if oldest_key is None:
+                break
+            scenario_recognition_cache.pop(oldest_key, None)
+
+        scenario_recognition_cache[key] = {
+            "value": dict(value),
+            "expire_at": expire_at,
+        }
+
+
 @app.route('/api/scenarios/recognize', methods=['POST'])
 def recognize_scenario():
     """根据主题和描述智能识别最匹配的访谈场景"""
@@ -27616,7 +28016,17 @@ def recognize_scenario():
     ai_result = None
     ai_last_error = None
     scenario_client = resolve_ai_client(call_type="scenario_recognize")
+    scenario_cache_key = ""
     if scenario_client:
+        # 输入防抖后仍会重复提交相同主题，相同 Prompt 直接复用上次的 AI 识别结果
+        scenario_cache_key = _build_scenario_recognition_cache_key(
+            resolve_model_name(call_type="scenario_recognize"),
+            prompt,
+        )
+        ai_result = _get_scenario_recognition_cache(scenario_cache_key)
+        if ai_result:
+            _record_cache_hit_metric("scenario_recognize_cache_hit")
+    if scenario_client and not ai_result:
         attempts = [
             {
                 "max_tokens": 220,
@@ -27650,6 +28060,7 @@ def recognize_scenario():
                 parsed = parse_scenario_recognition_response(raw, valid_scenario_ids)
                 if parsed:
                     ai_result = parsed
+                    _set_scenario_recognition_cache(scenario_cache_key, parsed)
                     break
 
                 raise ValueError(f"无法从响应提取有效场景结果，响应前120字: {raw[:120]}")
@@ -27698,7 +28109,7 @@ def ensure_user_for_phone(phone: str) -> tuple[Optional[sqlite3.Row], bool]:
         return existing, False
 
     now_iso = datetime.now(timezone.utc).isoformat()
-    random_password_hash = generate_password_hash(secrets.token_urlsafe(32), method="pbkdf2:sha256")
+    random_password_hash = build_placeholder_password_hash()
     try:
         with get_auth_db_connection() as conn:
             cursor = conn.execute(
@@ -28828,6 +29239,10 @@ def batch_delete_sessions():
 
 # ============ AI 驱动的访谈 API ============
 
+# 至多嵌套一层的 JSON 对象（问题解析正则兜底）
+_QUESTION_JSON_OBJECT_PATTERN = re.compile(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', re.DOTALL)
+
+
 def parse_question_response(response: str, debug: bool = False) -> Optional[dict]:
     """解析 AI 返回的问题 JSON 响应
 
@@ -28840,8 +29255,6 @@ def parse_question_response(response: str, debug: bool = False) -> Optional[dict
     Returns:
         解析后的 dict（包含 question 和 options），失败返回 None
     """
-    import re
-
     result = None
     parse_error = None
 
@@ -28899,47 +29312,16 @@ def parse_question_response(response: str, debug: bool = False) -> Optional[dict
     # 方法3: 查找第一个完整的 JSON 对象（花括号配对）
     if result is None:
         try:
-            json_start = response.find('{')
-            if json_start >= 0:
-                brace_count = 0
-                json_end = -1
-                in_string = False
-                escape_next = False
-
-                for i in range(json_start, len(response)):
-                    char = response[i]
-
-                    if escape_next:
-                        escape_next = False
-                        continue
-
-                    if char == '\\':
-                        escape_next = True
-                        continue
-
-                    if char == '"' and not escape_next:
-                        in_string = not in_string
-                        continue
-
-                    if not in_string:
-                        if char == '{':
-                            brace_count += 1
-                        elif char == '}':
-                            brace_count -= 1
-                            if brace_count == 0:
-                                json_end = i + 1
-                                break
-
-                if json_end > json_start:
-                    try:
-                        json_str = response[json_start:json_end]
-                        result = json.loads(json_str)
-                        if debug:
-                            print(f"✅ 方法3成功: 花括号配对提取")
-                    except json.JSONDecodeError as e:
-                        parse_error = e
-                        if debug:
-                            print(f"⚠️ 方法3失败 (JSON错误): {e}")
+            json_str = _extract_first_json_object(response)
+            if json_str:
+                try:
+                    result = json.loads(json_str)
+                    if debug:
+                        print(f"✅ 方法3成功: 花括号配对提取")
+                except json.JSONDecodeError as e:
+                    parse_error = e
+                    if debug:
+                        print(f"⚠️ 方法3失败 (JSON错误): {e}")
         except Exception as e:
             parse_error = e
             if debug:
@@ -28948,9 +29330,7 @@ def parse_question_response(response: str, debug: bool = False) -> Optional[dict
     # 方法4: 使用正则表达式提取 JSON 对象
     if result is None:
         try:
-            json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-            matches = re.findall(json_pattern, response, re.DOTALL)
-            for match in matches:
+            for match in _QUESTION_JSON_OBJECT_PATTERN.findall(response):
                 try:
                     candidate = json.loads(match)
                     # 验证必须有 question 字段
@@ -29861,6 +30241,7 @@ def generate_question_with_tiered_strategy(
 
 
 @app.route('/api/sessions/<session_id>/next-question', methods=['POST'])
+@with_interview_metric_memo
 def get_next_question(session_id):
     """获取下一个问题（AI 生成）"""
     user_id = get_current_user_id_or_none()
@@ -29904,12 +30285,13 @@ def get_next_question(session_id):
 
     session_file, session = loaded
     data = request.get_json() or {}
-    default_dim = get_dimension_order_for_session(session)[0] if get_dimension_order_for_session(session) else "customer_needs"
+    dimension_order = get_dimension_order_for_session(session)
+    default_dim = dimension_order[0] if dimension_order else "customer_needs"
     dimension = data.get("dimension", default_dim)
     prefer_prefetch = bool(data.get("prefer_prefetch", False))
     session_signature = get_file_signature(session_file)
     question_cache_key = _build_question_result_cache_key(session_id, dimension, session_signature)
-    cached_dim_logs = [log for log in session.get("interview_log", []) if log.get("dimension") == dimension]
+    cached_dim_logs = get_dimension_logs(session, dimension)
 
     def _should_discard_visible_question(payload: dict, source: str) -> bool:
         result = should_reject_visible_question(
@@ -29978,9 +30360,10 @@ def get_next_question(session_id):
         user_completed = dim_data.get("user_completed", False)
         if dim_coverage >= 100 or user_completed:
             # 维度已完成，忽略缓存，返回完成状态
-            all_dim_logs = [log for log in session.get("interview_log", []) if log.get("dimension") == dimension]
+            all_dim_logs = get_dimension_logs(session, dimension)
             formal_questions_count = len([log for log in all_dim_logs if not log.get("is_follow_up", False)])
-            dim_follow_ups = len([log for log in all_dim_logs if log.get("is_follow_up", False)])
+            dim_follow_ups = len(all_dim_logs) - formal_questions_count
+            follow_up_round = get_follow_up_round_for_dimension_logs(all_dim_logs)
             completion_reason = dim_data.get("completion_reason") or ("user_completed" if user_completed else "auto_completed")
             quality_warning = bool(dim_data.get("quality_warning", False))
             return jsonify({
@@ -29990,11 +30373,11 @@ def get_next_question(session_id):
                 "quality_warning": quality_warning,
                 "decision_meta": {
                     "mode": get_mode_identifier(session),
-                    "follow_up_round": get_follow_up_round_for_dimension_logs(all_dim_logs),
+                    "follow_up_round": follow_up_round,
                     "remaining_question_follow_up_budget": max(
                         0,
                         get_interview_mode_config(session).get("max_questions_per_formal", 1)
-                        - get_follow_up_round_for_dimension_logs(all_dim_logs)
+                        - follow_up_round
                     ),
                     "hard_triggered": False,
                     "missing_aspects": get_dimension_missing_aspects(session, dimension),
@@ -30007,7 +30390,7 @@ def get_next_question(session_id):
             })
 
         # 对预生成结果也做 is_follow_up 校验
-        all_dim_logs = [log for log in session.get("interview_log", []) if log.get("dimension") == dimension]
+        all_dim_logs = get_dimension_logs(session, dimension)
         if prefetched.get("is_follow_up", False) and all_dim_logs:
             last_log = all_dim_logs[-1]
             eval_result = evaluate_answer_depth(
@@ -30039,14 +30422,15 @@ def get_next_question(session_id):
                 prefetched["is_follow_up"] = False
                 prefetched["follow_up_reason"] = None
 
+        follow_up_round = get_follow_up_round_for_dimension_logs(all_dim_logs)
         prefetched_meta = dict(prefetched.get("decision_meta", {}) or {})
         prefetched_meta.update({
             "mode": get_mode_identifier(session),
-            "follow_up_round": get_follow_up_round_for_dimension_logs(all_dim_logs),
+            "follow_up_round": follow_up_round,
             "remaining_question_follow_up_budget": max(
                 0,
                 get_interview_mode_config(session).get("max_questions_per_formal", 1)
-                - get_follow_up_round_for_dimension_logs(all_dim_logs)
+                - follow_up_round
             ),
             "hard_triggered": False,
             "missing_aspects": get_dimension_missing_aspects(session, dimension),
@@ -30070,7 +30454,7 @@ def get_next_question(session_id):
         return jsonify(fallback)
 
     # 获取当前维度的所有记录
-    all_dim_logs = [log for log in session.get("interview_log", []) if log.get("dimension") == dimension]
+    all_dim_logs = get_dimension_logs(session, dimension)
 
     # 计算正式问题数量（排除追问）
     formal_questions_count = len([log for log in all_dim_logs if not log.get("is_follow_up", False)])
@@ -30085,7 +30469,8 @@ def get_next_question(session_id):
 
     # 维度已完成（用户手动完成或自动完成）
     if dim_coverage >= 100 or user_completed:
-        dim_follow_ups = len([log for log in all_dim_logs if log.get("is_follow_up", False)])
+        dim_follow_ups = len(all_dim_logs) - formal_questions_count
+        follow_up_round = get_follow_up_round_for_dimension_logs(all_dim_logs)
         completion_reason = dim_data.get("completion_reason") or ("user_completed" if user_completed else "auto_completed")
         quality_warning = bool(dim_data.get("quality_warning", False))
         return jsonify({
@@ -30095,8 +30480,8 @@ def get_next_question(session_id):
             "quality_warning": quality_warning,
             "decision_meta": {
                 "mode": get_mode_identifier(session),
-                "follow_up_round": get_follow_up_round_for_dimension_logs(all_dim_logs),
-                "remaining_question_follow_up_budget": max(0, mode_config.get("max_questions_per_formal", 1) - get_follow_up_round_for_dimension_logs(all_dim_logs)),
+                "follow_up_round": follow_up_round,
+                "remaining_question_follow_up_budget": max(0, mode_config.get("max_questions_per_formal", 1) - follow_up_round),
                 "hard_triggered": False,
                 "missing_aspects": get_dimension_missing_aspects(session, dimension),
             },
@@ -30125,7 +30510,7 @@ def get_next_question(session_id):
             save_session_json_and_sync(latest_session_file, latest_session)
             session = latest_session
 
-        dim_follow_ups = len([log for log in all_dim_logs if log.get("is_follow_up", False)])
+        dim_follow_ups = len(all_dim_logs) - formal_questions_count
         snapshot = completion.get("snapshot", {})
         return jsonify({
             "dimension": dimension,
@@ -30146,7 +30531,26 @@ def get_next_question(session_id):
             }
         })
 
+    # 同一问题已有实时生成在途时等待其结果，避免并发请求重复调用模型
+    generation_inflight_key = f"{question_cache_key}|generation"
+    generation_inflight_event, generation_inflight_owner = _begin_question_prefetch_inflight(generation_inflight_key)
+    if not generation_inflight_owner:
+        if isinstance(generation_inflight_event, threading.Event):
+            generation_inflight_event.wait(QUESTION_GENERATION_INFLIGHT_WAIT_SECONDS)
+        cached_question_payload = _get_question_result_cache(question_cache_key)
+        if isinstance(cached_question_payload, dict) and not _should_discard_visible_question(
+            cached_question_payload,
+            "inflight_question_result_cache",
+        ):
+            if ENABLE_DEBUG_LOG:
+                print(f"📦 等待在途生成后命中问题结果缓存: session={session_id}, dimension={dimension}")
+            _record_cache_hit_metric("question_result_cache_hit")
+            cached_question_payload["cached"] = True
+            return jsonify(cached_question_payload)
+
     if not try_enter_question_generation_queue():
+        if generation_inflight_owner:
+            _end_question_prefetch_inflight(generation_inflight_key, generation_inflight_event)
         return build_overload_response(
             "question_generation",
             message="问题生成链路繁忙，请稍后重试",
@@ -30158,6 +30562,8 @@ def get_next_question(session_id):
     )
     question_runtime_durations["queue_wait_ms"] = round(queue_wait_ms, 2)
     if not acquired_generation_slot:
+        if generation_inflight_owner:
+            _end_question_prefetch_inflight(generation_inflight_key, generation_inflight_event)
         return build_overload_response(
             "question_generation",
             message="问题生成队列繁忙，请稍后重试",
@@ -30577,6 +30983,8 @@ def get_next_question(session_id):
                 pass
         if question_generation_queue_slot_acquired:
             release_question_generation_queue_slot()
+        if generation_inflight_owner:
+            _end_question_prefetch_inflight(generation_inflight_key, generation_inflight_event)
 
 
 def get_fallback_question(session: dict, dimension: str) -> dict:
@@ -31720,7 +32128,6 @@ def upload_document(session_id):
                 return jsonify({"error": "文件内容为空"}), 400
         elif ext in ['.pdf', '.docx', '.xlsx', '.pptx']:
             # 先查 PostgreSQL 转换缓存，未命中再调用转换脚本
-            import subprocess
             source_hash = _compute_file_sha256(filepath)
             converted_cache_key = build_converted_cache_key(source_hash, ext)
             cached_markdown = get_converted_cache_content(converted_cache_key)
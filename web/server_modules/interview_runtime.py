@@ -48,9 +48,6 @@ def build_interview_prompt(
     """构建访谈 prompt（使用滑动窗口 + 摘要压缩 + 智能追问）"""
     topic = session.get("topic", "未知项目")
     description = session.get("description")
-    reference_materials = session.get("reference_materials", [])
-    if not reference_materials:
-        reference_materials = session.get("reference_docs", []) + session.get("research_docs", [])
     interview_log = session.get("interview_log", [])
     session_dim_info = get_dimension_info_for_session(session)
     dim_info = session_dim_info.get(dimension, {})
@@ -88,7 +85,11 @@ def build_interview_prompt(
     if is_lightweight_output:
         key_aspects = [_clip_prompt_text(item, 12) for item in key_aspects[:3] if _clip_prompt_text(item, 12)]
     key_aspects_text = "、".join(key_aspects) if key_aspects else "待补充"
-    effective_reference_materials = list(reference_materials or [])
+    # 参考资料在命中 Prompt 缓存之后才收集；兼容旧数据时合并 reference_docs / research_docs
+    reference_materials = session.get("reference_materials") or (
+        session.get("reference_docs", []) + session.get("research_docs", [])
+    )
+    effective_reference_materials = reference_materials
     doc_budget = MAX_TOTAL_DOCS
     if is_lightweight_output:
         if QUESTION_FAST_LIGHT_REFERENCE_DOCS_ENABLED:
@@ -100,6 +100,8 @@ def compute_report_quality_meta_v3(draft: dict, evidence_pack: dict, issues: lis
     weak_binding_count = 0
     rich_option_count = 0
     pending_follow_up_count = 0
+    actionable_total = 0
+    actionable_count = 0
     evidence_covered_by_field = {}
     weak_binding_count_by_field = {}
     answer_evidence_class_index = {}
@@ -118,6 +120,11 @@ def compute_report_quality_meta_v3(draft: dict, evidence_pack: dict, issues: lis
     for entry in claim_entries:
         refs = entry.get("evidence_refs", [])
         field = str(entry.get("field", "") or "").strip().lower()
+        # 可执行性统计与证据无关，在跳过无引用条目前同轮累计
+        if field in {"solutions", "actions"}:
+            actionable_total += 1
+            if entry.get("owner") and entry.get("timeline") and entry.get("metric"):
+                actionable_count += 1
         if not refs:
             continue
         evidence_covered += 1
@@ -171,12 +178,6 @@ def compute_report_quality_meta_v3(draft: dict, evidence_pack: dict, issues: lis
     else:
         consistency = max(0.0, 1.0 - unresolved_contradictions / contradiction_total)
 
-    action_entries = [entry for entry in claim_entries if entry.get("field") in {"solutions", "actions"}]
-    actionable_total = len(action_entries)
-    actionable_count = len([
-        entry for entry in action_entries
-        if entry.get("owner") and entry.get("timeline") and entry.get("metric")
-    ])
     actionability = (actionable_count / actionable_total) if actionable_total > 0 else 0.0
 
     needs = draft.get("needs", []) if isinstance(draft.get("needs", []), list) else []
@@ -2217,7 +2218,11 @@ def run_report_generation_job(
         quality_meta = _runtime_patchpoint(
             "build_report_quality_meta_fallback",
             build_report_quality_meta_fallback,
-        )(session, mode="simple_template_fallback")
+        )(
+            session,
+            mode="simple_template_fallback",
+            evidence_pack=fallback_evidence_pack,
+        )
         session["last_report_quality_meta"] = quality_meta
         update_report_generation_status(
             session_id,